@@ -0,0 +1,83 @@
+"""CPU cost against bytes saved when compressing sample pages.
+
+Pages are rendered the way `GET /samples/` renders them and compressed
+with each installed encoding at a few levels, in one piece like a page
+response goes through `CompressionMiddleware`.
+
+uv run python -m benchmarks.compression_benchmark
+"""
+
+import uuid
+from statistics import median
+from time import perf_counter
+
+from fastapi_pagination import Page
+from pydantic_core import to_json
+
+from src.dependencies.compression import ENCODERS, supported
+from src.dependencies.config import Compression, ContentEncoding
+from src.models import SamplePublic
+
+ROUNDS = 7
+PAGE_SIZES = (10, 50, 100, 500)
+LEVELS = {
+    ContentEncoding.GZIP: ("gzip_level", (1, 6, 9)),
+    ContentEncoding.BR: ("brotli_quality", (1, 4, 6)),
+    ContentEncoding.ZSTD: ("zstd_level", (1, 3, 9)),
+}
+
+
+def page(size: int) -> bytes:
+    items = [
+        SamplePublic(id=uuid.uuid4(), name=f"sample {n}") for n in range(size)
+    ]
+    return to_json(
+        Page[SamplePublic](
+            items=items, total=size * 20, page=1, size=size, pages=20
+        )
+    )
+
+
+def measure(
+    encoding: ContentEncoding, settings: Compression, body: bytes
+) -> tuple[float, int]:
+    number = max(1, 200_000 // len(body))
+
+    rounds = []
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        for _ in range(number):
+            compressed = ENCODERS[encoding](settings).compress(body, final=True)
+        rounds.append((perf_counter() - start) / number * 1e6)
+    return median(rounds), len(compressed)
+
+
+def main() -> None:
+    missing = set(ContentEncoding) - supported()
+    if missing:
+        print(f"skipping {', '.join(sorted(missing))}: library not installed")
+
+    for size in PAGE_SIZES:
+        body = page(size)
+        print(f"\npage of {size} samples, {len(body)} bytes")
+        print(
+            f"  {'encoding':<10} {'level':>5} {'us':>9} {'bytes':>8} "
+            f"{'saved':>7} {'us/KB saved':>12}"
+        )
+        for encoding in ContentEncoding:
+            if encoding not in supported():
+                continue
+            field, levels = LEVELS[encoding]
+            for level in levels:
+                settings = Compression(**{field: level})
+                micros, compressed = measure(encoding, settings, body)
+                saved = len(body) - compressed
+                print(
+                    f"  {encoding:<10} {level:>5} {micros:>9.1f} "
+                    f"{compressed:>8} {saved / len(body):>7.1%} "
+                    f"{micros / (saved / 1024):>12.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Per-request cost of resolving the `Config` dependency.
+
+Run from the project root so the config files are picked up:
+
+    uv run python -m benchmarks.config_benchmark
+"""
+
+import asyncio
+from timeit import timeit
+
+from src.dependencies.config import BaseConfig, aget_config, get_config
+
+NUMBER = 1_000
+
+
+def main() -> None:
+    get_config()
+    loop = asyncio.new_event_loop()
+
+    results = {
+        "parse (before)": timeit(BaseConfig, number=NUMBER),
+        "snapshot (after)": timeit(
+            lambda: loop.run_until_complete(aget_config()), number=NUMBER
+        ),
+    }
+    loop.close()
+
+    for name, seconds in results.items():
+        print(f"{name:<20} {seconds / NUMBER * 1e6:>10.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""End-to-end cost of rendering `Response[T]` envelopes.
+
+Compares FastAPI's default path (return annotation, response_model
+validation, jsonable_encoder) with returning a `FastJSONResponse`.
+
+uv run python -m benchmarks.response_benchmark
+"""
+
+import asyncio
+import uuid
+from statistics import median
+from time import perf_counter
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.models import SampleBulkResult, SampleBulkStatus, SamplePublic
+from src.schemas import FastJSONResponse, Response
+
+NUMBER = 500
+ROUNDS = 7
+BULK_SIZE = 1_000
+
+sample = SamplePublic(id=uuid.uuid4(), name="benchmark")
+results = [
+    SampleBulkResult(id=uuid.uuid4(), status=SampleBulkStatus.CREATED)
+    for _ in range(BULK_SIZE)
+]
+
+app = FastAPI()
+
+
+@app.get("/default/one")
+async def default_one() -> Response[SamplePublic]:
+    return Response[SamplePublic](data=sample)
+
+
+@app.get("/fast/one", response_model=Response[SamplePublic])
+async def fast_one() -> FastJSONResponse:
+    return FastJSONResponse(Response[SamplePublic](data=sample))
+
+
+@app.get("/default/bulk")
+async def default_bulk() -> Response[list[SampleBulkResult]]:
+    return Response[list[SampleBulkResult]](data=results)
+
+
+@app.get("/fast/bulk", response_model=Response[list[SampleBulkResult]])
+async def fast_bulk() -> FastJSONResponse:
+    return FastJSONResponse(Response[list[SampleBulkResult]](data=results))
+
+
+async def measure(client: AsyncClient, path: str, number: int) -> float:
+    assert (await client.get(path)).status_code == 200
+
+    start = perf_counter()
+    for _ in range(number):
+        await client.get(path)
+    return (perf_counter() - start) / number * 1e6
+
+
+async def main() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        default, fast = (
+            (await c.get("/default/bulk")),
+            await c.get("/fast/bulk"),
+        )
+        assert default.json() == fast.json()
+
+        for name, number in (("one", NUMBER), ("bulk", NUMBER // 10)):
+            # interleaved rounds so drift affects both paths alike
+            rounds = [
+                (
+                    await measure(c, f"/default/{name}", number),
+                    await measure(c, f"/fast/{name}", number),
+                )
+                for _ in range(ROUNDS)
+            ]
+            default = median(r[0] for r in rounds)
+            fast = median(r[1] for r in rounds)
+            print(
+                f"{name:<6} default {default:>9.1f} us/req  "
+                f"fast {fast:>9.1f} us/req  ({default / fast:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
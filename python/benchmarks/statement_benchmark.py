@@ -0,0 +1,70 @@
+"""CPU per query for statements built on every call against the prebuilt
+statements in `SampleRepository`.
+
+Runs on an in-memory SQLite database with a synchronous session, so the
+numbers are SQLAlchemy's own work: building the construct, generating
+its cache key, compiling on a cache miss, and executing.
+
+uv run python -m benchmarks.statement_benchmark
+"""
+
+import uuid
+from statistics import median
+from time import process_time
+
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel, select
+
+from src.models import Sample
+from src.repositories.sample_repository import READ_MANY
+
+NUMBER = 2_000
+ROUNDS = 7
+MANY = 50
+
+
+def measure(run) -> float:
+    rounds = []
+    for _ in range(ROUNDS):
+        start = process_time()
+        for _ in range(NUMBER):
+            run()
+        rounds.append((process_time() - start) / NUMBER * 1e6)
+    return median(rounds)
+
+
+def main() -> None:
+    ids = [uuid.uuid4() for _ in range(MANY)]
+
+    for cache_size in (500, 0):
+        engine = create_engine("sqlite://", query_cache_size=cache_size)
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add_all(Sample(id=id) for id in ids)
+            session.commit()
+
+            # single reads go through the batch loader too, so both sizes
+            # run the statement SampleService actually issues
+            cases = {
+                "read 1, built per call": lambda: session.exec(
+                    select(Sample).where(Sample.id.in_(ids[:1]))
+                ).one(),
+                "read 1, prebuilt": lambda: session.exec(
+                    READ_MANY[False], params={"ids": ids[:1]}
+                ).one(),
+                f"read {MANY}, built per call": lambda: session.exec(
+                    select(Sample).where(Sample.id.in_(ids))
+                ).all(),
+                f"read {MANY}, prebuilt": lambda: session.exec(
+                    READ_MANY[False], params={"ids": ids}
+                ).all(),
+            }
+
+            label = "cache" if cache_size else "no cache"
+            for name, run in cases.items():
+                session.expunge_all()
+                print(f"{label:<9} {name:<24} {measure(run):>8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
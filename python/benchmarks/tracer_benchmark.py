@@ -0,0 +1,95 @@
+"""Per-call overhead of the `tracer.observe` decorator.
+
+uv run python -m benchmarks.tracer_benchmark
+"""
+
+import asyncio
+import inspect
+from contextlib import contextmanager
+from timeit import timeit
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON
+from opentelemetry.semconv.trace import SpanAttributes
+from opentelemetry.trace import SpanKind
+
+from src.dependencies import tracer
+
+NUMBER = 20_000
+
+
+async def handler() -> None:
+    pass
+
+
+def observe_per_call(func):
+    """The decorator as it was before attributes were resolved up front."""
+
+    @contextmanager
+    def create_span():
+        with trace.get_tracer("benchmark").start_as_current_span(
+            func.__qualname__,
+            kind=SpanKind.INTERNAL,
+            record_exception=True,
+            set_status_on_exception=True,
+            end_on_exit=True,
+        ) as span:
+            span.set_attribute("service.name", "benchmark")
+            span.set_attribute(SpanAttributes.CODE_FUNCTION, func.__qualname__)
+            span.set_attribute(SpanAttributes.CODE_NAMESPACE, func.__module__)
+            span.set_attribute(
+                SpanAttributes.CODE_FILEPATH, inspect.getfile(func)
+            )
+            yield span
+
+    async def _awrapper(*args, **kwargs):
+        with create_span():
+            return await func(*args, **kwargs)
+
+    return _awrapper
+
+
+async def run(func) -> None:
+    for _ in range(NUMBER):
+        await func()
+
+
+def measure(loop: asyncio.AbstractEventLoop, func) -> float:
+    seconds = timeit(lambda: loop.run_until_complete(run(func)), number=1)
+    return seconds / NUMBER * 1e6
+
+
+def create_provider(sampler) -> TracerProvider:
+    provider = TracerProvider(sampler=sampler)
+    provider.add_span_processor(SimpleSpanProcessor(InMemorySpanExporter()))
+    return provider
+
+
+def main() -> None:
+    loop = asyncio.new_event_loop()
+    sampled = create_provider(ALWAYS_ON)
+    trace.set_tracer_provider(sampled)
+
+    baseline = measure(loop, handler)
+    results = {
+        "per-call attributes": measure(loop, observe_per_call(handler)),
+        "precomputed": measure(loop, tracer.observe(handler)),
+    }
+
+    tracer.tracer = create_provider(ALWAYS_OFF).get_tracer("benchmark")
+    results["precomputed, unsampled"] = measure(loop, tracer.observe(handler))
+    loop.close()
+
+    print(f"{'undecorated':<24} {baseline:>8.2f} us/call")
+    for name, micros in results.items():
+        print(f"{name:<24} {micros - baseline:>8.2f} us/call overhead")
+    print(f"{'tracing disabled':<24} {0:>8.2f} us/call overhead (undecorated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 import asyncio
 from logging.config import fileConfig
-from urllib.parse import quote
 
 from alembic import context
 from sqlalchemy import pool
@@ -8,28 +7,17 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 from sqlmodel import SQLModel
 
-from src.dependencies.config import Config, get_config
+from src.dependencies.database import get_url
 from src.models import Sample
 
 config = context.config
-app_config: Config = get_config()
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 target_metadata = SQLModel.metadata
 
-url = ""
-if app_config.database.url:
-    url = app_config.database.url
-else:
-    url = (
-        f"{app_config.database.kind}+{app_config.database.adapter}://"
-        f"{app_config.database.username}:{quote(app_config.database.password)}@"
-        f"{app_config.database.host}:{app_config.database.port}/"
-        f"{app_config.database.name}"
-    )
-config.set_main_option("sqlalchemy.url", url)
+config.set_main_option("sqlalchemy.url", get_url())
 
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,66 @@
+"""index sample filters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 19:04:11.208614
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: str | Sequence[str] | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # built concurrently so writes are not blocked on a live table, which
+    # PostgreSQL only allows outside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_samples_updated_at_id",
+            "samples",
+            ["updated_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_samples_name_id",
+            "samples",
+            ["name", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_samples_name_pattern",
+            "samples",
+            ["name"],
+            unique=False,
+            postgresql_ops={"name": "text_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_samples_name_pattern",
+            table_name="samples",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_samples_name_id",
+            table_name="samples",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_samples_updated_at_id",
+            table_name="samples",
+            postgresql_concurrently=True,
+        )
@@ -1,12 +1,24 @@
 from .config import Config, Environment  # noqa: I001
 from .logger import Logger
-from .database import Database
-from .http_client import HttpClient
+from .database import Database, Engine, Pool, StatementCache
+from .cache import Cache
+from .single_flight import SingleFlight
+from .http_client import HttpClient, HttpTransport
+from .metrics import Metrics
+from .conditional import Conditional
 
 __all__ = [
+    "Cache",
+    "Conditional",
     "Config",
     "Database",
+    "Engine",
     "Environment",
     "HttpClient",
+    "HttpTransport",
     "Logger",
+    "Metrics",
+    "Pool",
+    "SingleFlight",
+    "StatementCache",
 ]
@@ -0,0 +1,85 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from typing import Any
+
+Batch = Callable[[list[Any]], Awaitable[Mapping[Hashable, Any]]]
+
+
+class BatchLoader:
+    """Merges the `load` calls made during one event-loop iteration into a
+    single call of `batch`, which maps each key it finds to its value.
+
+    Meant to live as long as one request: batches run one at a time
+    because they share the request's database session, and values are
+    not kept once a batch resolves. The first caller of an iteration runs
+    the batch in its own task, so a cancelled request cancels its query
+    before the session is closed; if only that caller is cancelled, one
+    of the others retries and runs it.
+    """
+
+    batch: Batch
+    max_batch_size: int
+    pending: dict[Hashable, asyncio.Future]
+    lock: asyncio.Lock
+
+    def __init__(
+        self,
+        batch: Batch,
+        max_batch_size: int = 1000,
+    ) -> None:
+        self.batch = batch
+        self.max_batch_size = max_batch_size
+        self.pending = {}
+        self.lock = asyncio.Lock()
+
+    async def load(self, key: Hashable) -> Any:
+        while True:
+            future = self.pending.get(key)
+            if future is None:
+                leads = not self.pending
+                future = self.pending[key] = (
+                    asyncio.get_running_loop().create_future()
+                )
+                if leads:
+                    await self._resolve()
+
+            # one caller giving up must not fail the others waiting on the key
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if (
+                    future.cancelled()
+                    and not asyncio.current_task().cancelling()
+                ):
+                    continue
+                raise
+
+    async def load_many(self, keys: Iterable[Hashable]) -> list[Any]:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    async def _resolve(self) -> None:
+        pending = self.pending
+
+        try:
+            # every caller already scheduled for this tick adds its key first
+            await asyncio.sleep(0)
+            self.pending = {}
+
+            keys = list(pending)
+            async with self.lock:
+                for start in range(0, len(keys), self.max_batch_size):
+                    chunk = keys[start : start + self.max_batch_size]
+                    values = await self.batch(chunk)
+                    for key in chunk:
+                        if not pending[key].done():
+                            pending[key].set_result(values.get(key))
+        except asyncio.CancelledError:
+            if self.pending is pending:
+                self.pending = {}
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as error:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error)
@@ -0,0 +1,274 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Annotated, Any
+
+from fastapi import Depends, FastAPI, Request
+
+from src.dependencies.config import CacheBackend, Config, get_config
+from src.dependencies.logger import Logger, get_logger
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger: Logger = get_logger(get_config())
+
+
+# what an invalidated key holds; cached values are JSON, never empty
+TOMBSTONE = b""
+
+
+class BaseCache:
+    """Byte-oriented key/value cache with hit, miss and eviction counters.
+
+    Reads fill the cache with `add`, which never replaces a live entry,
+    and writes invalidate with `delete`, which leaves a tombstone for
+    `tombstone_ttl` seconds. A read that loaded a row before a write and
+    fills after the write's invalidation then finds the tombstone and
+    leaves the cache empty, rather than caching the old row until `ttl`.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> bytes | None:
+        value = await self._get(key)
+        if not value:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    async def add(self, key: str, value: bytes) -> None:
+        await self._add(key, value)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._delete(*keys)
+
+    async def close(self) -> None:
+        pass
+
+    def status(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    async def _get(self, key: str) -> bytes | None:
+        return None
+
+    async def _add(self, key: str, value: bytes) -> None:
+        pass
+
+    async def _delete(self, *keys: str) -> None:
+        pass
+
+
+class MemoryCache(BaseCache):
+    """In-process LRU cache with per-entry TTL."""
+
+    max_size: int
+    ttl: float
+    tombstone_ttl: float
+    entries: OrderedDict[str, tuple[float, bytes]]
+
+    def __init__(
+        self, max_size: int, ttl: float, tombstone_ttl: float = 5
+    ) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.tombstone_ttl = tombstone_ttl
+        self.entries = OrderedDict()
+
+    async def _get(self, key: str) -> bytes | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+
+        self.entries.move_to_end(key)
+        return value
+
+    async def _add(self, key: str, value: bytes) -> None:
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] >= time.monotonic():
+            return
+
+        self._store(key, self.ttl, value)
+
+    async def _delete(self, *keys: str) -> None:
+        for key in keys:
+            self._store(key, self.tombstone_ttl, TOMBSTONE)
+
+    def _store(self, key: str, ttl: float, value: bytes) -> None:
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+class RedisCache(BaseCache):
+    """Cache on a Redis server through redis-py's asyncio client.
+
+    Commands run on a bounded connection pool and each is limited to
+    `timeout` seconds; a pooled connection found dead is replaced and the
+    command retried once. Errors are logged and treated as cache misses
+    so the database stays the source of truth. Invalidations that fail
+    are kept and retried before the next read, so a write's invalidation
+    is not lost to a dropped connection.
+    """
+
+    ttl: int
+    tombstone_ttl: int
+    timeout: float
+    client: "Redis"
+    stale: set[str]
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float,
+        tombstone_ttl: float = 5,
+        timeout: float = 0.5,
+        pool_size: int = 4,
+    ) -> None:
+        # imported here so the client is only loaded when it is used
+        from redis.asyncio import BlockingConnectionPool, Redis
+        from redis.asyncio.retry import Retry
+        from redis.backoff import NoBackoff
+
+        super().__init__()
+        self.ttl = max(int(ttl), 1)
+        self.tombstone_ttl = max(int(tombstone_ttl * 1000), 1)
+        self.timeout = timeout
+        self.client = Redis(
+            connection_pool=BlockingConnectionPool.from_url(
+                url,
+                max_connections=pool_size,
+                # waiting for a free connection counts toward the timeout
+                timeout=timeout,
+                socket_timeout=timeout,
+                socket_connect_timeout=timeout,
+                # once, on a fresh connection, when a pooled one is dead
+                retry=Retry(NoBackoff(), 1),
+                # RESP2 is spoken by every Redis-protocol server, RESP3
+                # (the default from redis-py 8) only by Redis 6 and later
+                protocol=2,
+            ),
+        )
+        self.stale = set()
+
+    async def _execute(self, command: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `command`, bounded by `timeout` as a whole.
+
+        Raises:
+            RedisError, TimeoutError: the server is unreachable, slower
+                than `timeout`, or replied with an error.
+        """
+        async with asyncio.timeout(self.timeout):
+            return await command()
+
+    async def _command(
+        self, name: str, command: Callable[[], Awaitable[Any]]
+    ) -> tuple[bool, Any]:
+        from redis.exceptions import RedisError
+
+        try:
+            return True, await self._execute(command)
+        except (RedisError, TimeoutError) as error:
+            logger.warning(f"cache command {name} failed: {error!r}")
+            return False, None
+
+    async def _flush_stale(self) -> bool:
+        keys = list(self.stale)
+
+        async def tombstone() -> None:
+            async with self.client.pipeline(transaction=False) as pipeline:
+                for key in keys:
+                    pipeline.set(key, TOMBSTONE, px=self.tombstone_ttl)
+                await pipeline.execute()
+
+        done, _ = await self._command("SET", tombstone)
+        if done:
+            self.stale.difference_update(keys)
+        return done
+
+    async def _get(self, key: str) -> bytes | None:
+        # an entry whose invalidation is pending may be stale, so nothing
+        # is read until the invalidations went through
+        if self.stale and not await self._flush_stale():
+            return None
+
+        _, value = await self._command("GET", lambda: self.client.get(key))
+        return value
+
+    async def _add(self, key: str, value: bytes) -> None:
+        await self._command(
+            "SET",
+            lambda: self.client.set(key, value, ex=self.ttl, nx=True),
+        )
+
+    async def _delete(self, *keys: str) -> None:
+        self.stale.update(keys)
+        await self._flush_stale()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_cache() -> BaseCache:
+    config: Config = get_config()
+
+    match config.cache.backend:
+        case CacheBackend.MEMORY:
+            return MemoryCache(
+                config.cache.max_size,
+                config.cache.ttl,
+                tombstone_ttl=config.cache.tombstone_ttl,
+            )
+        case CacheBackend.REDIS:
+            return RedisCache(
+                config.cache.url,
+                config.cache.ttl,
+                tombstone_ttl=config.cache.tombstone_ttl,
+                timeout=config.cache.timeout,
+                pool_size=config.cache.pool_size,
+            )
+        case _:
+            return BaseCache()
+
+
+async def init(app: FastAPI):
+    app.state.cache = create_cache()
+
+
+async def dispose(app: FastAPI):
+    await app.state.cache.close()
+
+
+async def get_cache(request: Request) -> BaseCache:
+    return request.app.state.cache
+
+
+Cache = Annotated[BaseCache, Depends(get_cache)]
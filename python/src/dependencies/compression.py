@@ -0,0 +1,215 @@
+import sys
+import zlib
+from collections.abc import Callable, Iterable
+from functools import cache
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.dependencies.config import (
+    Compression,
+    Config,
+    ContentEncoding,
+    get_config,
+)
+
+COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+        "application/xml",
+        "image/svg+xml",
+    }
+)
+
+
+class Encoder(Protocol):
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress `data` and flush it, finishing the stream if `final`,
+        so every chunk can be sent as soon as it is produced."""
+        ...
+
+
+class GzipEncoder:
+    def __init__(self, settings: Compression) -> None:
+        self.compressor = zlib.compressobj(
+            settings.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+class BrotliEncoder:
+    def __init__(self, settings: Compression) -> None:
+        brotli = import_module("brotli")
+        self.compressor = brotli.Compressor(quality=settings.brotli_quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self.compressor.process(data) + (
+            self.compressor.finish() if final else self.compressor.flush()
+        )
+
+
+class ZstdEncoder:
+    def __init__(self, settings: Compression) -> None:
+        if sys.version_info >= (3, 14):
+            zstd = import_module("compression.zstd")
+            self.compressor = zstd.ZstdCompressor(level=settings.zstd_level)
+            self.flush_block = zstd.ZstdCompressor.FLUSH_BLOCK
+            self.flush_frame = zstd.ZstdCompressor.FLUSH_FRAME
+        else:
+            zstandard = import_module("zstandard")
+            self.compressor = zstandard.ZstdCompressor(
+                level=settings.zstd_level
+            ).compressobj()
+            self.flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            self.flush_frame = zstandard.COMPRESSOBJ_FLUSH_FINISH
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush(
+            self.flush_frame if final else self.flush_block
+        )
+
+
+ENCODERS: dict[ContentEncoding, Callable[[Compression], Encoder]] = {
+    ContentEncoding.GZIP: GzipEncoder,
+    ContentEncoding.BR: BrotliEncoder,
+    ContentEncoding.ZSTD: ZstdEncoder,
+}
+
+
+@cache
+def supported() -> frozenset[ContentEncoding]:
+    """Encodings whose libraries are installed; brotli and zstd are
+    optional."""
+    encodings = {ContentEncoding.GZIP}
+    if find_spec("brotli") is not None:
+        encodings.add(ContentEncoding.BR)
+    if sys.version_info >= (3, 14) or find_spec("zstandard") is not None:
+        encodings.add(ContentEncoding.ZSTD)
+    return frozenset(encodings)
+
+
+def negotiate(
+    accept_encoding: str, encodings: Iterable[ContentEncoding]
+) -> ContentEncoding | None:
+    """The encoding with the highest `q` in `accept_encoding`, ties going
+    to the first in `encodings`."""
+    weights: dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        weight = 1.0
+        key, _, value = params.strip().partition("=")
+        if key == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compressible(status: int, headers: Headers) -> bool:
+    if status < 200 or status in (204, 304) or "content-encoding" in headers:
+        return False
+
+    media_type = headers.get("content-type", "").partition(";")[0].strip()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class CompressionMiddleware:
+    """Compresses text and JSON responses with the best encoding the
+    client accepts.
+
+    Bodies sent in one piece are left alone under `minimum_size`;
+    streamed bodies are compressed and flushed chunk by chunk, so nothing
+    is buffered beyond the chunk at hand.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # a HEAD response's Content-Length is that of the uncompressed body
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            return await self.app(scope, receive, send)
+
+        config: Config = get_config()
+        settings = config.compression
+
+        encoding = (
+            negotiate(
+                Headers(scope=scope).get("accept-encoding", ""),
+                (e for e in settings.encodings if e in supported()),
+            )
+            if settings.enabled
+            else None
+        )
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start: Message | None = None
+        encoder: Encoder | None = None
+
+        async def _send(message: Message) -> None:
+            nonlocal start, encoder
+
+            if message["type"] == "http.response.start":
+                # held back until the first chunk shows whether to compress
+                start = message
+                return
+
+            if message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                headers = MutableHeaders(scope=start)
+                if compressible(start["status"], headers):
+                    headers.add_vary_header("Accept-Encoding")
+                    if more_body or len(body) >= settings.minimum_size:
+                        encoder = ENCODERS[encoding](settings)
+                        headers["Content-Encoding"] = encoding
+                        if "content-length" in headers:
+                            del headers["Content-Length"]
+
+                if encoder is not None:
+                    body = encoder.compress(body, final=not more_body)
+                    if not more_body:
+                        headers["Content-Length"] = str(len(body))
+                    message = {**message, "body": body}
+
+                await send(start)
+                start = None
+                return await send(message)
+
+            if encoder is not None:
+                message = {
+                    **message,
+                    "body": encoder.compress(body, final=not more_body),
+                }
+            await send(message)
+
+        await self.app(scope, receive, _send)
@@ -0,0 +1,126 @@
+import hashlib
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Annotated, Protocol
+from uuid import UUID
+
+from fastapi import Depends, Request, status
+from fastapi.responses import Response
+
+
+class Versioned(Protocol):
+    id: UUID
+    updated_at: datetime
+
+
+class Preconditions:
+    """`If-None-Match` and `If-Modified-Since` of a request, evaluated
+    against validators built by `validators` and `collection_etag`."""
+
+    if_none_match: set[str] | None
+    if_modified_since: datetime | None
+
+    def __init__(
+        self,
+        if_none_match: str | None = None,
+        if_modified_since: str | None = None,
+    ) -> None:
+        self.if_none_match = (
+            {_opaque(tag) for tag in if_none_match.split(",")}
+            if if_none_match is not None
+            else None
+        )
+        self.if_modified_since = _parse_http_date(if_modified_since)
+
+    def __bool__(self) -> bool:
+        return (
+            self.if_none_match is not None or self.if_modified_since is not None
+        )
+
+    def not_modified(
+        self,
+        etag: str,
+        last_modified: datetime | None = None,
+    ) -> bool:
+        # If-Modified-Since is ignored when If-None-Match is sent
+        if self.if_none_match is not None:
+            return (
+                "*" in self.if_none_match or _opaque(etag) in self.if_none_match
+            )
+
+        if self.if_modified_since is None or last_modified is None:
+            return False
+
+        # HTTP dates have whole-second precision
+        last_modified = _utc(last_modified).replace(microsecond=0)
+        return last_modified <= self.if_modified_since
+
+
+def _opaque(tag: str) -> str:
+    """Strip the weak prefix; If-None-Match uses the weak comparison."""
+    return tag.strip().removeprefix("W/")
+
+
+def _parse_http_date(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+
+    try:
+        return _utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _utc(value: datetime) -> datetime:
+    # naive timestamps are written with datetime.now, i.e. local time
+    return value.astimezone(UTC)
+
+
+def etag(*parts: object) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(_utc(value), usegmt=True)
+
+
+def validators(item: Versioned) -> dict[str, str]:
+    """ETag and Last-Modified headers of a single resource."""
+    return {
+        "ETag": etag(item.id, item.updated_at.isoformat()),
+        "Last-Modified": http_date(item.updated_at),
+        "Cache-Control": "no-cache",
+    }
+
+
+def collection_etag(items: Iterable[Versioned], *parts: object) -> str:
+    """ETag of a list of resources, covering every item's version and
+    whatever else shapes the list, like a page's total or cursors.
+
+    A list has no Last-Modified: removing an item changes the list but
+    not the newest `updated_at` in it.
+    """
+    return etag(
+        *parts,
+        *(f"{item.id}:{item.updated_at.isoformat()}" for item in items),
+    )
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+async def get_preconditions(request: Request) -> Preconditions:
+    return Preconditions(
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+    )
+
+
+Conditional = Annotated[Preconditions, Depends(get_preconditions)]
@@ -1,12 +1,15 @@
+import asyncio
 import json
+import logging
+import signal
 from enum import StrEnum, auto
 from os import environ
 from pathlib import Path
 from typing import Annotated, Any
 
 import aiofiles
-from fastapi import Depends
-from pydantic import BaseModel, Field
+from fastapi import Depends, FastAPI
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic.fields import FieldInfo
 from pydantic_settings import (
     BaseSettings,
@@ -16,6 +19,7 @@ from pydantic_settings import (
     TomlConfigSettingsSource,
     YamlConfigSettingsSource,
 )
+from yaml import YAMLError
 
 
 class Settings(BaseSettings):
@@ -23,6 +27,7 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         env_nested_delimiter="__",
         extra="ignore",
+        frozen=True,
         nested_model_default_partial_update=True,
         json_file=environ.get("CONFIG_JSON", "config.json"),
         toml_file=environ.get("CONFIG_TOML", "config.toml"),
@@ -61,10 +66,23 @@ class LoggingLevel(StrEnum):
 
 
 class Logging(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     level: LoggingLevel = LoggingLevel.INFO
+    batch_size: int = 100
+    sampling: dict[str, float] = {}
+    rate_limit: int = 0
+    rate_limit_interval: float = 60
+
+
+class ReplicaSelection(StrEnum):
+    ROUND_ROBIN = auto()
+    LEAST_LATENCY = auto()
 
 
 class Database(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     url: str | None = None
     kind: str = "postgresql"
     adapter: str = "psycopg"
@@ -73,6 +91,147 @@ class Database(BaseModel):
     host: str = "localhost"
     port: int = 5432
     name: str = "database"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    query_cache_size: int = 500
+    prepare_threshold: int | None = 5
+    bulk_chunk_size: int = 1000
+    stream_chunk_size: int = 1000
+    query_budget: int = 0
+    slow_query_threshold: float = 0.5
+    n_plus_one_threshold: int = 10
+    echo: bool = False
+    create_all: bool = False
+    replicas: list[str] = []
+    replica_selection: ReplicaSelection = ReplicaSelection.ROUND_ROBIN
+    replica_max_lag: float = 5
+    replica_cache_max_lag: float = 0
+    replica_check_interval: float = 5
+    read_your_writes: int = 5
+
+
+class SpanExporter(StrEnum):
+    CLOUD_TRACE = auto()
+    MEMORY = auto()
+
+
+class Tracing(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = True
+    exporter: SpanExporter = SpanExporter.CLOUD_TRACE
+    sample_ratio: float = Field(default=1.0, ge=0.0, le=1.0)
+    parent_based: bool = True
+
+
+class CacheBackend(StrEnum):
+    NONE = auto()
+    MEMORY = auto()
+    REDIS = auto()
+
+
+class Cache(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    backend: CacheBackend = CacheBackend.MEMORY
+    url: str = "redis://localhost:6379/0"
+    max_size: int = 10_000
+    ttl: float = 60
+    tombstone_ttl: float = 5
+    timeout: float = 0.5
+    pool_size: int = 4
+
+
+class HttpClient(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5
+    http2: bool = False
+    connect_timeout: float = 5
+    read_timeout: float = 60
+    pool_timeout: float = 5
+    retries: int = 2
+    backoff: float = 0.1
+    backoff_max: float = 2
+
+
+class Metrics(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = True
+    buckets: tuple[float, ...] = (
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+    loop_lag_interval: float = 0.5
+
+
+class Health(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    interval: float = 5
+    timeout: float = 2
+    max_database_latency: float = 0.5
+    max_pool_saturation: float = Field(default=0.9, ge=0.0, le=1.0)
+
+
+class ContentEncoding(StrEnum):
+    ZSTD = auto()
+    BR = auto()
+    GZIP = auto()
+
+
+class Compression(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = True
+    minimum_size: int = 1024
+    encodings: tuple[ContentEncoding, ...] = (
+        ContentEncoding.ZSTD,
+        ContentEncoding.BR,
+        ContentEncoding.GZIP,
+    )
+    gzip_level: int = Field(default=6, ge=1, le=9)
+    brotli_quality: int = Field(default=4, ge=0, le=11)
+    zstd_level: int = Field(default=3, ge=1, le=22)
+
+
+class EventLoop(StrEnum):
+    AUTO = auto()
+    ASYNCIO = auto()
+    UVLOOP = auto()
+
+
+class HttpProtocol(StrEnum):
+    AUTO = auto()
+    H11 = auto()
+    HTTPTOOLS = auto()
+
+
+class Server(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    workers: int = Field(default=1, ge=0)
+    loop: EventLoop = EventLoop.AUTO
+    http: HttpProtocol = HttpProtocol.AUTO
+    backlog: int = 2048
+    keep_alive: int = 5
+    graceful_shutdown: float = 30
+    limit_max_requests: int = 0
 
 
 class BaseConfig(Settings):
@@ -82,14 +241,95 @@ class BaseConfig(Settings):
     environment: Environment = Environment.DEVELOPMENT
     logging: Logging = Logging()
     database: Database = Database()
+    cache: Cache = Cache()
+    tracing: Tracing = Tracing()
+    http_client: HttpClient = HttpClient()
+    metrics: Metrics = Metrics()
+    health: Health = Health()
+    compression: Compression = Compression()
+    server: Server = Server()
+    hot_reload: bool = False
+
+
+_config: BaseConfig | None = None
+
+
+def reload_config() -> BaseConfig:
+    """Parse the config sources and atomically swap the shared snapshot."""
+    global _config
+
+    _config = BaseConfig()
+    return _config
 
 
 async def aget_config() -> BaseConfig:
-    return BaseConfig()
+    return get_config()
 
 
 def get_config() -> BaseConfig:
-    return BaseConfig()
+    if _config is None:
+        return reload_config()
+    return _config
+
+
+def _reload() -> None:
+    logger = logging.getLogger(get_config().service)
+
+    # invalid values and JSON or TOML syntax raise ValueError, YAML syntax
+    # YAMLError, and a file replaced mid-save OSError; any of them would
+    # otherwise end the watcher or escape the signal handler
+    try:
+        config = reload_config()
+    except (ValueError, YAMLError, OSError) as error:
+        logger.error(f"keeping previous config, reload failed: {error}")
+        return
+
+    logger.info(f"reloaded config for {config.service}")
+
+
+def _config_files() -> list[Path]:
+    return [
+        Path(file)
+        for file in (
+            Settings.model_config["json_file"],
+            Settings.model_config["toml_file"],
+            Settings.model_config["yaml_file"],
+        )
+        if Path(file).exists()
+    ]
+
+
+async def _watch(files: list[Path]) -> None:
+    from watchfiles import awatch
+
+    async for _ in awatch(*files):
+        _reload()
+
+
+async def init(app: FastAPI):
+    if not get_config().hot_reload:
+        return
+
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGHUP, _reload)
+    except (AttributeError, NotImplementedError, RuntimeError):
+        pass
+
+    files = _config_files()
+    if files:
+        app.state.config_watcher = asyncio.create_task(_watch(files))
+
+
+async def dispose(app: FastAPI):
+    watcher: asyncio.Task | None = getattr(app.state, "config_watcher", None)
+    if watcher:
+        watcher.cancel()
+
+    try:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    except (AttributeError, NotImplementedError, RuntimeError):
+        pass
 
 
 Config = Annotated[BaseConfig, Depends(aget_config)]
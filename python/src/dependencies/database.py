@@ -1,60 +1,611 @@
-from typing import Annotated
+import asyncio
+import contextlib
+import hashlib
+import re
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from itertools import count
+from time import perf_counter
+from typing import Annotated, Any
 from urllib.parse import quote
 
-from fastapi import Depends
+from fastapi import Depends, FastAPI, Request
+from opentelemetry.semconv.trace import SpanAttributes
+from opentelemetry.trace import SpanKind
+from opentelemetry.trace.status import StatusCode
+from sqlalchemy import ExceptionContext, event, make_url, text
+from sqlalchemy.engine.default import CacheStats
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
+    async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from src.dependencies.config import Config, get_config
+from src.dependencies.config import Config, ReplicaSelection, get_config
 from src.dependencies.logger import Logger, get_logger
+from src.dependencies.tracer import tracer
+from src.exceptions import QueryBudgetExceededError
 
-config: Config = get_config()
-logger: Logger = get_logger(config)
+logger: Logger = get_logger(get_config())
 
+CACHE_RESULTS = {
+    CacheStats.CACHE_HIT: "hit",
+    CacheStats.CACHE_MISS: "miss",
+    CacheStats.CACHING_DISABLED: "disabled",
+    CacheStats.NO_CACHE_KEY: "uncacheable",
+    CacheStats.NO_DIALECT_SUPPORT: "unsupported",
+}
 
-async def create_engine() -> AsyncEngine:
-    url = ""
 
-    if config.database.url:
-        url = config.database.url
-    else:
-        url = (
-            f"{config.database.kind}+{config.database.adapter}://"
-            f"{config.database.username}:{quote(config.database.password)}@"
-            f"{config.database.host}:{config.database.port}/"
-            f"{config.database.name}"
+class PoolMetrics:
+    """Connection pool checkout wait time and saturation."""
+
+    checkouts: int
+    wait_total: float
+    wait_max: float
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+    def status(self, engine: AsyncEngine) -> dict[str, Any]:
+        pool = engine.pool
+        size = pool.size()
+        checked_out = pool.checkedout()
+        capacity = size + get_config().database.max_overflow
+
+        return {
+            "size": size,
+            "checked_out": checked_out,
+            "overflow": max(pool.overflow(), 0),
+            "saturation": checked_out / capacity if capacity else 0.0,
+            "checkouts": self.checkouts,
+            "wait_avg": (
+                self.wait_total / self.checkouts if self.checkouts else 0.0
+            ),
+            "wait_max": self.wait_max,
+        }
+
+
+class MeteredPool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long each checkout waited.
+
+    Timing the checkout here rather than in `get_session` lets sessions
+    stay lazy, so requests that never query never hold a connection.
+    """
+
+    metrics: PoolMetrics | None = None
+
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        connection = super().connect()
+        if self.metrics is not None:
+            self.metrics.observe(perf_counter() - start)
+        return connection
+
+    def recreate(self) -> "MeteredPool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class StatementCacheMetrics:
+    """How often executed statements were found in the compiled cache."""
+
+    results: dict[str, int]
+
+    def __init__(self) -> None:
+        self.results = dict.fromkeys(CACHE_RESULTS.values(), 0)
+
+    def observe(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        result = CACHE_RESULTS.get(getattr(context, "cache_hit", None))
+        if result is not None:
+            self.results[result] += 1
+
+    def status(self) -> dict[str, Any]:
+        lookups = self.results["hit"] + self.results["miss"]
+
+        return {
+            **self.results,
+            "hit_ratio": self.results["hit"] / lookups if lookups else 0.0,
+        }
+
+
+# string and numeric literals, and each driver's placeholder style
+LITERALS = re.compile(r"'(?:[^']|'')*'|%\(\w+\)s|%s|\$\d+|\?|\b\d+(?:\.\d+)?\b")
+# casts psycopg adds to placeholders inside lists and rows
+PLACEHOLDER_CASTS = re.compile(r"\?::[\w ]+?(?:\[\])?(?=\s*[,)])")
+# IN lists and multi-row VALUES, whose length depends on the data
+LITERAL_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+LITERAL_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+WHITESPACE = re.compile(r"\s+")
+
+# (start, span) of the statements running on a connection
+QUERY_STARTS = "query_starts"
+
+# lag, as of its last check, of the replica a session reads from; absent
+# for sessions on the primary
+SESSION_REPLICA_LAG = "replica_lag"
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> tuple[str, str]:
+    """`statement` with every literal and placeholder replaced by `?`,
+    and a short hash of that; statements differing only in their values
+    or in the number of ids bound share a fingerprint."""
+    normalized = LITERALS.sub("?", statement)
+    normalized = PLACEHOLDER_CASTS.sub("?", normalized)
+    normalized = LITERAL_LISTS.sub("(?)", normalized)
+    normalized = LITERAL_ROWS.sub("(?)", normalized)
+    normalized = WHITESPACE.sub(" ", normalized).strip()
+
+    digest = hashlib.blake2b(normalized.encode(), digest_size=8)
+    return normalized, digest.hexdigest()
+
+
+def _redact(parameters: Any, executemany: bool) -> str:
+    """Names and types of the bound parameters, never their values."""
+    if executemany:
+        return f"{len(parameters)} parameter sets"
+    # bulk statements bind thousands
+    if len(parameters or ()) > 20:
+        return f"{len(parameters)} parameters"
+    if isinstance(parameters, Mapping):
+        return ", ".join(
+            f"{name}: {type(value).__name__}"
+            for name, value in parameters.items()
         )
+    return ", ".join(type(value).__name__ for value in parameters or ())
+
+
+class QueryCounter:
+    """Number of SQL statements executed within one request, and how
+    often each fingerprint repeated.
+
+    Counters nest: a statement counts toward this counter and every
+    enclosing one, so an inner budget never hides work from an outer one.
+    """
+
+    statements: int
+    fingerprints: Counter[str]
+    parent: "QueryCounter | None"
+
+    def __init__(self, parent: "QueryCounter | None" = None) -> None:
+        self.statements = 0
+        self.fingerprints = Counter()
+        self.parent = parent
+
+
+_query_counter: ContextVar[QueryCounter | None] = ContextVar(
+    "query_counter", default=None
+)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    normalized, digest = fingerprint(statement)
+
+    counter = _query_counter.get()
+    while counter is not None:
+        counter.statements += 1
+        counter.fingerprints[normalized] += 1
+        counter = counter.parent
+
+    span = None
+    if get_config().tracing.enabled:
+        operation = normalized.partition(" ")[0].upper()
+        # a child of whichever span is current in the issuing request
+        span = tracer.start_span(
+            f"{operation} {conn.engine.url.database}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                SpanAttributes.DB_SYSTEM: conn.dialect.name,
+                SpanAttributes.DB_NAME: conn.engine.url.database or "",
+                SpanAttributes.DB_OPERATION: operation,
+                SpanAttributes.DB_STATEMENT: normalized,
+                "db.statement.fingerprint": digest,
+            },
+        )
+
+    conn.info.setdefault(QUERY_STARTS, []).append((perf_counter(), span))
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    start, span = conn.info[QUERY_STARTS].pop()
+    duration = perf_counter() - start
+    if span is not None:
+        span.end()
+
+    threshold = get_config().database.slow_query_threshold
+    if threshold and duration >= threshold:
+        normalized, digest = fingerprint(statement)
+        logger.warning(
+            f"slow query {digest} took {duration * 1000:.1f} ms: "
+            f"{normalized} [{_redact(parameters, executemany)}]"
+        )
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    conn = context.connection
+    # only a failed cursor execute leaves its start behind
+    if conn is None or not conn.info.get(QUERY_STARTS):
+        return
+
+    _, span = conn.info[QUERY_STARTS].pop()
+    if span is not None:
+        span.record_exception(context.original_exception)
+        span.set_status(StatusCode.ERROR, str(context.original_exception))
+        span.end()
+
+
+@contextmanager
+def query_budget(limit: int | None = None) -> Iterator[QueryCounter]:
+    """Count statements executed in this context, optionally enforcing a
+    maximum. Budgets nest; each one also sees the statements of the
+    budgets opened inside it.
+
+    Raises:
+        QueryBudgetExceededError: more than `limit` statements were executed.
+    """
+    counter = QueryCounter(parent=_query_counter.get())
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+    if limit is not None and counter.statements > limit:
+        raise QueryBudgetExceededError(counter.statements, limit)
+
+
+class QueryCountMiddleware:
+    """Reports the statements issued by each request in `X-Query-Count`."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with query_budget() as counter:
+
+            async def _send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-query-count", str(counter.statements).encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, _send)
+
+        config: Config = get_config()
+
+        limit = config.database.query_budget
+        if limit and counter.statements > limit:
+            logger.warning(
+                f"{scope['method']} {scope['path']} executed "
+                f"{counter.statements} statements, budget is {limit}"
+            )
+
+        threshold = config.database.n_plus_one_threshold
+        for statement, times in counter.fingerprints.items():
+            if threshold and times > threshold:
+                logger.warning(
+                    f"{scope['method']} {scope['path']} ran statement "
+                    f"{fingerprint(statement)[1]} {times} times, likely an "
+                    f"N+1 query: {statement}"
+                )
+
+
+# zero while caught up, so an idle primary does not read as lag
+REPLICA_LAG = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+        THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+SAFE_METHODS = frozenset({"GET", "HEAD"})
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "x-read-primary"
+
+
+class Replica:
+    """A read replica with its own pool and the result of its last check."""
+
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    healthy: bool
+    latency: float
+    lag: float
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.healthy = False
+        self.latency = 0.0
+        self.lag = 0.0
+
+    async def check(self) -> None:
+        start = perf_counter()
+        try:
+            async with self.engine.connect() as conn:
+                if self.engine.dialect.name == "postgresql":
+                    lag = await conn.scalar(REPLICA_LAG)
+                else:
+                    await conn.execute(text("SELECT 1"))
+                    lag = 0
+        except Exception as error:
+            if self.healthy:
+                logger.warning(f"replica {self.engine.url} is down: {error}")
+            self.healthy = False
+            return
+
+        latency = perf_counter() - start
+        # smoothed so one slow check does not move all traffic
+        if self.healthy:
+            latency = 0.8 * self.latency + 0.2 * latency
+        self.latency = latency
+        self.lag = float(lag or 0)
+        self.healthy = True
+
+
+class ReplicaSet:
+    """Picks a healthy replica within the lag cutoff for each read."""
+
+    replicas: list[Replica]
+    selection: ReplicaSelection
+    max_lag: float
+    counter: count
+    monitor: asyncio.Task | None
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        selection: ReplicaSelection,
+        max_lag: float,
+    ) -> None:
+        self.replicas = replicas
+        self.selection = selection
+        self.max_lag = max_lag
+        self.counter = count()
+        self.monitor = None
+
+    def select(self) -> Replica | None:
+        candidates = [
+            replica
+            for replica in self.replicas
+            if replica.healthy and replica.lag <= self.max_lag
+        ]
+        if not candidates:
+            return None
+
+        if self.selection == ReplicaSelection.LEAST_LATENCY:
+            return min(candidates, key=lambda replica: replica.latency)
+        return candidates[next(self.counter) % len(candidates)]
+
+    async def check(self) -> None:
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    async def dispose(self) -> None:
+        if self.monitor is not None:
+            self.monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.monitor
+
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+async def _monitor_replicas(replicas: ReplicaSet, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await replicas.check()
+
+
+class ReadYourWritesMiddleware:
+    """Pins a client's reads to the primary for a short window after a
+    successful write, so it never reads data older than its own."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        config: Config = get_config()
+
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not config.database.replicas
+            or not config.database.read_your_writes
+        ):
+            return await self.app(scope, receive, send)
+
+        cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; "
+            f"Max-Age={config.database.read_your_writes}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        ).encode()
+
+        async def _send(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400
+            ):
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, _send)
+
+
+def get_url() -> str:
+    config: Config = get_config()
+
+    if config.database.url:
+        return config.database.url
+
+    return (
+        f"{config.database.kind}+{config.database.adapter}://"
+        f"{config.database.username}:{quote(config.database.password)}@"
+        f"{config.database.host}:{config.database.port}/"
+        f"{config.database.name}"
+    )
+
+
+def create_engine(url: str | None = None) -> AsyncEngine:
+    config: Config = get_config()
+    url = url or get_url()
 
     logger.info(f"creating database engine: {url}")
 
-    return create_async_engine(url=url, echo=True, future=True)
+    connect_args = {}
+    if make_url(url).get_driver_name() == "psycopg":
+        connect_args["prepare_threshold"] = config.database.prepare_threshold
 
+    engine = create_async_engine(
+        url=url,
+        echo=config.database.echo,
+        connect_args=connect_args,
+        query_cache_size=config.database.query_cache_size,
+        poolclass=MeteredPool,
+        pool_size=config.database.pool_size,
+        max_overflow=config.database.max_overflow,
+        pool_timeout=config.database.pool_timeout,
+        pool_recycle=config.database.pool_recycle,
+        pool_pre_ping=config.database.pool_pre_ping,
+    )
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+    )
+    event.listen(
+        engine.sync_engine, "after_cursor_execute", _after_cursor_execute
+    )
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
 
-async def init():
-    engine = await create_engine()
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+    return engine
 
 
-async def get_session(
-    engine: Annotated[AsyncEngine, Depends(create_engine)],
-) -> AsyncSession:
-    logger.info("creating database session")
+async def init(app: FastAPI):
+    engine = create_engine()
 
-    session = sessionmaker(
+    app.state.engine = engine
+    app.state.sessionmaker = async_sessionmaker(
         bind=engine, class_=AsyncSession, expire_on_commit=False
     )
+    app.state.pool_metrics = PoolMetrics()
+    engine.pool.metrics = app.state.pool_metrics
+
+    config: Config = get_config()
+
+    if config.database.create_all:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    replicas = ReplicaSet(
+        [Replica(create_engine(url)) for url in config.database.replicas],
+        config.database.replica_selection,
+        config.database.replica_max_lag,
+    )
+    if replicas.replicas:
+        await replicas.check()
+        replicas.monitor = asyncio.create_task(
+            _monitor_replicas(replicas, config.database.replica_check_interval)
+        )
+
+    app.state.replicas = replicas
+
+    app.state.statement_cache_metrics = StatementCacheMetrics()
+    for observed in (
+        engine,
+        *(replica.engine for replica in replicas.replicas),
+    ):
+        event.listen(
+            observed.sync_engine,
+            "after_cursor_execute",
+            app.state.statement_cache_metrics.observe,
+        )
+
+
+async def dispose(app: FastAPI):
+    logger.info("disposing database engine")
+
+    await app.state.replicas.dispose()
+    await app.state.engine.dispose()
+
+
+async def get_engine(request: Request) -> AsyncEngine:
+    return request.app.state.engine
+
+
+async def get_pool_metrics(request: Request) -> PoolMetrics:
+    return request.app.state.pool_metrics
+
+
+async def get_statement_cache_metrics(
+    request: Request,
+) -> StatementCacheMetrics:
+    return request.app.state.statement_cache_metrics
+
+
+def _read_primary(request: Request) -> bool:
+    return (
+        request.method not in SAFE_METHODS
+        or READ_PRIMARY_HEADER in request.headers
+        or READ_PRIMARY_COOKIE in request.cookies
+    )
+
+
+async def get_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session on the primary, or on a replica for reads that are not
+    pinned to the primary by a recent write."""
+    sessionmaker = request.app.state.sessionmaker
+    info = {}
+    if not _read_primary(request):
+        replica = request.app.state.replicas.select()
+        if replica is not None:
+            sessionmaker = replica.sessionmaker
+            info[SESSION_REPLICA_LAG] = replica.lag
+
+    logger.info("creating database session")
 
-    async with session() as session:
+    async with sessionmaker(info=info) as session:
         yield session
-        await session.close()
 
     logger.info("closing database session")
 
 
 Database = Annotated[AsyncSession, Depends(get_session)]
+Engine = Annotated[AsyncEngine, Depends(get_engine)]
+Pool = Annotated[PoolMetrics, Depends(get_pool_metrics)]
+StatementCache = Annotated[
+    StatementCacheMetrics, Depends(get_statement_cache_metrics)
+]
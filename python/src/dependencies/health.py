@@ -0,0 +1,121 @@
+import asyncio
+import contextlib
+from datetime import UTC, datetime
+from importlib import metadata
+from time import perf_counter
+from typing import Annotated
+
+from fastapi import Depends, FastAPI, Request
+
+from src.dependencies.config import Config, get_config
+from src.dependencies.logger import Logger, get_logger
+from src.repositories import HealthRepository
+
+logger: Logger = get_logger(get_config())
+
+
+class HealthProbe:
+    """Latest readiness result, refreshed by a background task so health
+    endpoints never touch the database themselves."""
+
+    version: str
+    database: bool
+    database_latency: float | None
+    pool_saturation: float
+    reasons: list[str]
+    checked_at: datetime | None
+    monitor: asyncio.Task | None
+
+    def __init__(self, version: str) -> None:
+        self.version = version
+        self.database = False
+        self.database_latency = None
+        self.pool_saturation = 0.0
+        self.reasons = ["not probed yet"]
+        self.checked_at = None
+        self.monitor = None
+
+    @property
+    def ready(self) -> bool:
+        return not self.reasons
+
+
+def get_version(service: str) -> str:
+    try:
+        return metadata.version(service)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+async def probe(app: FastAPI, health: HealthProbe) -> None:
+    config: Config = get_config()
+
+    start = perf_counter()
+    try:
+        async with (
+            asyncio.timeout(config.health.timeout),
+            app.state.sessionmaker() as session,
+        ):
+            database = await HealthRepository(session).check()
+    except TimeoutError:
+        database = False
+    latency = perf_counter() - start
+
+    saturation = app.state.pool_metrics.status(app.state.engine)["saturation"]
+
+    reasons = []
+    if not database:
+        reasons.append("database unreachable")
+    elif latency > config.health.max_database_latency:
+        reasons.append(
+            f"database latency {latency:.3f}s above "
+            f"{config.health.max_database_latency}s"
+        )
+    if saturation > config.health.max_pool_saturation:
+        reasons.append(
+            f"pool saturation {saturation:.2f} above "
+            f"{config.health.max_pool_saturation}"
+        )
+
+    if reasons != health.reasons:
+        logger.info(f"readiness changed: {', '.join(reasons) or 'ready'}")
+
+    health.database = database
+    health.database_latency = latency if database else None
+    health.pool_saturation = saturation
+    health.reasons = reasons
+    health.checked_at = datetime.now(UTC)
+
+
+async def _monitor(app: FastAPI, health: HealthProbe) -> None:
+    while True:
+        await asyncio.sleep(get_config().health.interval)
+        try:
+            await probe(app, health)
+        except Exception as error:
+            logger.exception(f"health probe failed: {error}")
+
+
+async def init(app: FastAPI):
+    config: Config = get_config()
+
+    health = HealthProbe(get_version(config.service))
+    await probe(app, health)
+    health.monitor = asyncio.create_task(_monitor(app, health))
+
+    app.state.health = health
+
+
+async def dispose(app: FastAPI):
+    health: HealthProbe = app.state.health
+
+    health.monitor.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await health.monitor
+
+
+async def get_health(request: Request) -> HealthProbe:
+    return request.app.state.health
+
+
+Health = Annotated[HealthProbe, Depends(get_health)]
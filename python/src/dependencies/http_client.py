@@ -1,12 +1,167 @@
-from typing import Annotated
+import asyncio
+import random
+from importlib.util import find_spec
+from typing import Annotated, Any
 
-from fastapi import Depends
-from httpx import AsyncClient
+from fastapi import Depends, FastAPI, Request
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    AsyncHTTPTransport,
+    ConnectError,
+    ConnectTimeout,
+    Limits,
+    Timeout,
+)
+from httpx import Request as HttpRequest
+from httpx import Response as HttpResponse
 
+from src.dependencies.config import Config, get_config
+from src.dependencies.logger import Logger, get_logger
 
-async def get_client() -> AsyncClient:
-    async with AsyncClient(timeout=60) as client:
-        yield client
+logger: Logger = get_logger(get_config())
+
+IDEMPOTENT_METHODS = frozenset(
+    {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"}
+)
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class RetryTransport(AsyncBaseTransport):
+    """Retries with full-jitter exponential backoff.
+
+    Connection failures are retried for every method since the request
+    never reached the server; 502, 503 and 504 responses only for
+    idempotent methods.
+    """
+
+    transport: AsyncBaseTransport
+    retries: int
+    backoff: float
+    backoff_max: float
+    requests: int
+    retried: int
+    failures: int
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        retries: int,
+        backoff: float,
+        backoff_max: float,
+    ) -> None:
+        self.transport = transport
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+
+    async def handle_async_request(self, request: HttpRequest) -> HttpResponse:
+        self.requests += 1
+        attempt = 0
+
+        while True:
+            try:
+                response = await self.transport.handle_async_request(request)
+            except (ConnectError, ConnectTimeout):
+                if attempt >= self.retries:
+                    self.failures += 1
+                    raise
+            else:
+                if (
+                    attempt >= self.retries
+                    or response.status_code not in RETRY_STATUSES
+                    or request.method not in IDEMPOTENT_METHODS
+                ):
+                    return response
+                await response.aclose()
+
+            self.retried += 1
+            delay = min(self.backoff_max, self.backoff * 2**attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def status(self) -> dict[str, Any]:
+        # only the default transport exposes its httpcore pool
+        pool = getattr(self.transport, "_pool", None)
+        connections = getattr(pool, "connections", [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+
+        return {
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+            "requests": self.requests,
+            "retries": self.retried,
+            "failures": self.failures,
+        }
+
+
+def create_transport(
+    transport: AsyncBaseTransport | None = None,
+) -> RetryTransport:
+    """Wrap `transport`, or a pooled HTTP transport built from config, in
+    retries; pass an `httpx.MockTransport` to stub outbound calls."""
+    config: Config = get_config()
+    settings = config.http_client
+
+    if transport is None:
+        http2 = settings.http2
+        if http2 and find_spec("h2") is None:
+            logger.warning("http2 requires the h2 package, using HTTP/1.1")
+            http2 = False
+
+        transport = AsyncHTTPTransport(
+            http2=http2,
+            limits=Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+        )
+
+    return RetryTransport(
+        transport, settings.retries, settings.backoff, settings.backoff_max
+    )
+
+
+def create_client(transport: RetryTransport) -> AsyncClient:
+    config: Config = get_config()
+    settings = config.http_client
+
+    return AsyncClient(
+        transport=transport,
+        timeout=Timeout(
+            settings.read_timeout,
+            connect=settings.connect_timeout,
+            pool=settings.pool_timeout,
+        ),
+    )
+
+
+async def init(app: FastAPI):
+    transport = create_transport()
+
+    app.state.http_client = create_client(transport)
+    app.state.http_transport = transport
+
+
+async def dispose(app: FastAPI):
+    await app.state.http_client.aclose()
+
+
+async def get_client(request: Request) -> AsyncClient:
+    return request.app.state.http_client
+
+
+async def get_transport(request: Request) -> RetryTransport:
+    return request.app.state.http_transport
 
 
 HttpClient = Annotated[AsyncClient, Depends(get_client)]
+HttpTransport = Annotated[RetryTransport, Depends(get_transport)]
@@ -1,19 +1,230 @@
 import logging
+import random
 import sys
+import threading
+import time
+from collections.abc import Callable
+from logging.handlers import QueueHandler
+from queue import Empty, SimpleQueue
 from typing import Annotated
 
-from fastapi import Depends
-from google.cloud.logging.handlers import StructuredLogHandler
+from fastapi import Depends, FastAPI
+from opentelemetry import trace
 
 from src.dependencies.config import Config, get_config
 
+# echo=True logs every statement through this logger
+SQLALCHEMY_LOGGER = "sqlalchemy.engine.Engine"
 
-async def init():
+
+class TraceContextFilter(logging.Filter):
+    """Captures the active span on the calling thread before the record is
+    queued, since the writer thread has no trace context of its own."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = trace.get_current_span().get_span_context()
+        if context.is_valid:
+            record.trace = format(context.trace_id, "032x")
+            record.span_id = format(context.span_id, "016x")
+            record.trace_sampled = context.trace_flags.sampled
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a configured ratio of records below WARNING per logger name."""
+
+    rates: dict[str, float]
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.rates or record.levelno >= logging.WARNING:
+            return True
+
+        name = record.name
+        while name:
+            if name in self.rates:
+                return random.random() < self.rates[name]
+            name = name.rpartition(".")[0]
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Drops repeats of the same message beyond `limit` per `interval`.
+
+    The first record of the next window carries the number of dropped
+    repeats in its `suppressed` label. Records are filtered on whichever
+    thread logs them, so the windows are only touched under a lock.
+    """
+
+    limit: int
+    interval: float
+    windows: dict[tuple[str, int, str], list]
+    lock: threading.Lock
+
+    def __init__(self, limit: int, interval: float) -> None:
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self.windows = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.limit:
+            return True
+
+        with self.lock:
+            return self._count(record)
+
+    def _count(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        key = (record.name, record.levelno, str(record.msg))
+        window = self.windows.get(key)
+
+        if window is None or now - window[0] >= self.interval:
+            if len(self.windows) > 1024:
+                self._prune(now)
+            self.windows[key] = [now, 1, 0]
+            if window is not None and window[2]:
+                record.labels = {
+                    **getattr(record, "labels", {}),
+                    "suppressed": str(window[2]),
+                }
+            return True
+
+        window[1] += 1
+        if window[1] > self.limit:
+            window[2] += 1
+            return False
+        return True
+
+    def _prune(self, now: float) -> None:
+        for key, window in list(self.windows.items()):
+            if now - window[0] >= self.interval:
+                del self.windows[key]
+
+
+class BatchQueueListener:
+    """Drains queued records on a background thread and writes each batch
+    with a single write and flush.
+
+    The handler is created on that thread, so whatever it imports stays
+    off the startup path; records queue up until it is ready.
+    """
+
+    queue: SimpleQueue
+    create_handler: Callable[[], logging.StreamHandler]
+    handler: logging.StreamHandler | None
+    batch_size: int
+    thread: threading.Thread | None
+
+    def __init__(
+        self,
+        queue: SimpleQueue,
+        create_handler: Callable[[], logging.StreamHandler],
+        batch_size: int,
+    ) -> None:
+        self.queue = queue
+        self.create_handler = create_handler
+        self.handler = None
+        self.batch_size = batch_size
+        self.thread = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(
+            target=self._monitor, name="log-writer", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is None:
+            return
+
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+
+    def _monitor(self) -> None:
+        self.handler = self.create_handler()
+
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except Empty:
+                    break
+
+            if None in batch:
+                running = False
+            self._write([record for record in batch if record is not None])
+
+    def _write(self, records: list[logging.LogRecord]) -> None:
+        lines = []
+        for record in records:
+            try:
+                if self.handler.filter(record):
+                    lines.append(self.handler.format(record))
+            except Exception:
+                self.handler.handleError(record)
+
+        if not lines:
+            return
+
+        try:
+            self.handler.stream.write("\n".join(lines) + "\n")
+            self.handler.flush()
+        except Exception:
+            self.handler.handleError(records[-1])
+
+
+def create_handler() -> logging.StreamHandler:
+    # google-cloud-logging pulls in google-auth and requests
+    from google.cloud.logging.handlers import StructuredLogHandler
+
+    return StructuredLogHandler(stream=sys.stdout)
+
+
+async def init(app: FastAPI):
     config: Config = get_config()
 
+    queue = SimpleQueue()
+    handler = QueueHandler(queue)
+    handler.addFilter(TraceContextFilter())
+    handler.addFilter(SamplingFilter(config.logging.sampling))
+    handler.addFilter(
+        RateLimitFilter(
+            config.logging.rate_limit, config.logging.rate_limit_interval
+        )
+    )
+
     logger = logging.getLogger(config.service)
     logger.setLevel(config.logging.level.upper())
-    logger.addHandler(StructuredLogHandler(stream=sys.stdout))
+    logger.addHandler(handler)
+
+    sqlalchemy_logger = logging.getLogger(SQLALCHEMY_LOGGER)
+    sqlalchemy_logger.addHandler(handler)
+    sqlalchemy_logger.propagate = False
+
+    listener = BatchQueueListener(
+        queue, create_handler, config.logging.batch_size
+    )
+    listener.start()
+
+    app.state.log_handler = handler
+    app.state.log_listener = listener
+
+
+async def dispose(app: FastAPI):
+    config: Config = get_config()
+
+    # detached first, so nothing is queued after the listener's sentinel
+    logging.getLogger(config.service).removeHandler(app.state.log_handler)
+    logging.getLogger(SQLALCHEMY_LOGGER).removeHandler(app.state.log_handler)
+    app.state.log_listener.stop()
 
 
 async def aget_logger(config: Config) -> logging.Logger:
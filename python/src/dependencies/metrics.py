@@ -0,0 +1,231 @@
+import asyncio
+import contextlib
+from bisect import bisect_left
+from collections.abc import Iterable
+from time import perf_counter
+from typing import Annotated
+
+from fastapi import Depends, FastAPI, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.dependencies.config import Config, get_config
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Sample = tuple[dict[str, str], float]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observed values."""
+
+    buckets: tuple[float, ...]
+    counts: list[int]
+    sum: float
+    count: int
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: dict[str, str]) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(
+            (*self.buckets, "+Inf"), self.counts, strict=True
+        ):
+            cumulative += count
+            le = bound if isinstance(bound, str) else repr(float(bound))
+            lines.append(
+                f"{name}_bucket{format_labels({**labels, 'le': le})} "
+                f"{cumulative}"
+            )
+        lines.append(f"{name}_sum{format_labels(labels)} {self.sum!r}")
+        lines.append(f"{name}_count{format_labels(labels)} {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Request latency, in-flight requests and event-loop lag.
+
+    Recording is a dict lookup and a bisect per request; everything else
+    is pulled from the pool, cache and HTTP client when scraped.
+    """
+
+    buckets: tuple[float, ...]
+    requests: dict[tuple[str, str, str], Histogram]
+    in_flight: int
+    loop_lag: float
+    loop_lag_histogram: Histogram
+    monitor: asyncio.Task | None
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.requests = {}
+        self.in_flight = 0
+        self.loop_lag = 0.0
+        self.loop_lag_histogram = Histogram(LOOP_LAG_BUCKETS)
+        self.monitor = None
+
+    def observe_request(
+        self, method: str, route: str, status: str, seconds: float
+    ) -> None:
+        key = (method, route, status)
+        histogram = self.requests.get(key)
+        if histogram is None:
+            histogram = self.requests[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def observe_loop_lag(self, seconds: float) -> None:
+        self.loop_lag = seconds
+        self.loop_lag_histogram.observe(seconds)
+
+    def render(self) -> list[str]:
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), histogram in self.requests.items():
+            lines += histogram.samples(
+                "http_request_duration_seconds",
+                {"method": method, "route": route, "status": status},
+            )
+
+        lines += metric(
+            "http_requests_in_flight",
+            "gauge",
+            "Requests currently being served.",
+            self.in_flight,
+        )
+        lines += metric(
+            "event_loop_lag_seconds",
+            "gauge",
+            "Delay of the most recent event-loop lag probe.",
+            self.loop_lag,
+        )
+        lines += [
+            "# HELP event_loop_lag_probe_seconds Event-loop lag probes.",
+            "# TYPE event_loop_lag_probe_seconds histogram",
+            *self.loop_lag_histogram.samples(
+                "event_loop_lag_probe_seconds", {}
+            ),
+        ]
+        return lines
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    pairs = ",".join(
+        f'{key}="{escape(str(value))}"' for key, value in labels.items()
+    )
+    return f"{{{pairs}}}"
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def metric(
+    name: str, kind: str, help: str, samples: float | Iterable[Sample]
+) -> list[str]:
+    """Render one metric family in the Prometheus text format."""
+    if isinstance(samples, int | float):
+        samples = [({}, samples)]
+
+    return [
+        f"# HELP {name} {help}",
+        f"# TYPE {name} {kind}",
+        *(
+            f"{name}{format_labels(labels)} {value!r}"
+            for labels, value in samples
+        ),
+    ]
+
+
+class MetricsMiddleware:
+    """Records latency per route template and the number of in-flight
+    requests."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        registry: MetricsRegistry | None = getattr(
+            scope["app"].state, "metrics", None
+        )
+        if registry is None:
+            return await self.app(scope, receive, send)
+
+        status = "500"
+
+        async def _send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        registry.in_flight += 1
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            registry.in_flight -= 1
+            # the template rather than the raw path keeps cardinality bounded
+            route = scope.get("route")
+            registry.observe_request(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status,
+                perf_counter() - start,
+            )
+
+
+async def _monitor_loop_lag(registry: MetricsRegistry, interval: float):
+    while True:
+        start = perf_counter()
+        await asyncio.sleep(interval)
+        registry.observe_loop_lag(max(perf_counter() - start - interval, 0.0))
+
+
+async def init(app: FastAPI):
+    config: Config = get_config()
+
+    if not config.metrics.enabled:
+        return
+
+    registry = MetricsRegistry(tuple(config.metrics.buckets))
+    registry.monitor = asyncio.create_task(
+        _monitor_loop_lag(registry, config.metrics.loop_lag_interval)
+    )
+
+    app.state.metrics = registry
+
+
+async def dispose(app: FastAPI):
+    registry: MetricsRegistry | None = getattr(app.state, "metrics", None)
+    if registry is None or registry.monitor is None:
+        return
+
+    registry.monitor.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await registry.monitor
+
+
+async def get_metrics(request: Request) -> MetricsRegistry | None:
+    return getattr(request.app.state, "metrics", None)
+
+
+Metrics = Annotated[MetricsRegistry | None, Depends(get_metrics)]
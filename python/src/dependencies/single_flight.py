@@ -0,0 +1,76 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from functools import partial
+from typing import Annotated, Any, TypeVar
+
+from fastapi import Depends, FastAPI, Request
+
+T = TypeVar("T")
+
+
+class SingleFlightGroup:
+    """Runs one call per key at a time and shares its outcome with every
+    concurrent caller for that key.
+
+    The first caller leads: the call runs as a task it awaits directly,
+    so cancelling the leader cancels the call and releases whatever the
+    leader's request holds. Followers wait on it shielded; if it was
+    cancelled under them, one of them retries and leads. Results and
+    errors are shared but never kept once the call completes.
+    """
+
+    calls: dict[Hashable, asyncio.Task]
+    executed: int
+    coalesced: int
+
+    def __init__(self) -> None:
+        self.calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            call = self.calls.get(key)
+            if call is None or call.cancelled():
+                self.executed += 1
+                call = asyncio.ensure_future(func())
+                self.calls[key] = call
+                call.add_done_callback(partial(self._forget, key))
+                return await call
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if call.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+    def _forget(self, key: Hashable, call: asyncio.Task) -> None:
+        if self.calls.get(key) is call:
+            del self.calls[key]
+
+    def status(self) -> dict[str, Any]:
+        calls = self.executed + self.coalesced
+
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.calls),
+            "coalesced_ratio": self.coalesced / calls if calls else 0.0,
+        }
+
+
+async def init(app: FastAPI):
+    app.state.single_flight = SingleFlightGroup()
+
+
+async def dispose(app: FastAPI):
+    pass
+
+
+async def get_single_flight(request: Request) -> SingleFlightGroup:
+    return request.app.state.single_flight
+
+
+SingleFlight = Annotated[SingleFlightGroup, Depends(get_single_flight)]
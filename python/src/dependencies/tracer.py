@@ -1,83 +1,158 @@
 import inspect
 from collections.abc import Callable, Iterator
-from contextlib import asynccontextmanager, contextmanager
+from contextlib import asynccontextmanager
 from functools import wraps
+from typing import TYPE_CHECKING
 
+from fastapi import FastAPI
 from opentelemetry import trace
-from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
-from opentelemetry.propagate import set_global_textmap
-from opentelemetry.propagators.cloud_trace_propagator import (
-    CloudTraceFormatPropagator,
-)
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.span import Span
 from opentelemetry.trace.status import StatusCode
 
-from src.dependencies.config import Config, get_config
+from src.dependencies.config import Config, SpanExporter, get_config
 
-config: Config = get_config()
+# the SDK, propagator and exporter are imported by init() so that only
+# the lightweight API is loaded at import time
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.sampling import Sampler
 
+# resolves to the real tracer once init() installs the provider
+tracer = trace.get_tracer(get_config().service)
+
+
+def create_sampler() -> "Sampler":
+    from opentelemetry.sdk.trace.sampling import (
+        ParentBased,
+        TraceIdRatioBased,
+    )
+
+    config: Config = get_config()
+
+    sampler = TraceIdRatioBased(config.tracing.sample_ratio)
+    if config.tracing.parent_based:
+        return ParentBased(sampler)
+    return sampler
+
+
+async def init(app: FastAPI):
+    config: Config = get_config()
+
+    if not config.tracing.enabled:
+        return
+
+    from opentelemetry.propagate import set_global_textmap
+    from opentelemetry.propagators.cloud_trace_propagator import (
+        CloudTraceFormatPropagator,
+    )
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SimpleSpanProcessor,
+    )
 
-async def init():
     tracer_provider = TracerProvider(
         resource=Resource.create({"service.name": config.service}),
+        sampler=create_sampler(),
     )
-    trace.set_tracer_provider(tracer_provider)
 
-    trace.get_tracer_provider().add_span_processor(
-        BatchSpanProcessor(CloudTraceSpanExporter())
-    )
+    match config.tracing.exporter:
+        case SpanExporter.MEMORY:
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+                InMemorySpanExporter,
+            )
+
+            exporter = InMemorySpanExporter()
+            tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+            app.state.span_exporter = exporter
+        case _:
+            from opentelemetry.exporter.cloud_trace import (
+                CloudTraceSpanExporter,
+            )
+
+            tracer_provider.add_span_processor(
+                BatchSpanProcessor(CloudTraceSpanExporter())
+            )
 
+    trace.set_tracer_provider(tracer_provider)
     set_global_textmap(CloudTraceFormatPropagator())
 
+    app.state.tracer_provider = tracer_provider
+
+
+async def dispose(app: FastAPI):
+    tracer_provider: TracerProvider | None = getattr(
+        app.state, "tracer_provider", None
+    )
+    if tracer_provider:
+        tracer_provider.shutdown()
+
 
 @asynccontextmanager
 async def track(name: str) -> Iterator[Span]:
-    tracer = trace.get_tracer(config.service)
     with tracer.start_as_current_span(
         name,
         kind=SpanKind.INTERNAL,
+        attributes={"service.name": get_config().service},
         record_exception=True,
         set_status_on_exception=True,
         end_on_exit=True,
     ) as span:
-        span.set_attribute("service.name", config.service)
         yield span
         span.set_status(StatusCode.OK)
 
 
-@contextmanager
-def create_span(func: Callable):
-    tracer = trace.get_tracer(config.service)
-    with tracer.start_as_current_span(
-        func.__qualname__,
-        kind=SpanKind.INTERNAL,
-        record_exception=True,
-        set_status_on_exception=True,
-        end_on_exit=True,
-    ) as span:
-        span.set_attribute("service.name", config.service)
-        span.set_attribute(SpanAttributes.CODE_FUNCTION, func.__qualname__)
-        span.set_attribute(SpanAttributes.CODE_NAMESPACE, func.__module__)
-        span.set_attribute(SpanAttributes.CODE_FILEPATH, inspect.getfile(func))
-        yield span
-        span.set_status(StatusCode.OK)
-
+def observe(func: Callable) -> Callable:
+    """Wrap `func` in an internal span.
+
+    The span name and code attributes are resolved once here rather than
+    on every call, and `func` is returned untouched when tracing is
+    disabled.
+    """
+    config: Config = get_config()
+
+    if not config.tracing.enabled:
+        return func
+
+    try:
+        filepath = inspect.getfile(func)
+    except TypeError:
+        filepath = ""
+
+    name = func.__qualname__
+    attributes = {
+        "service.name": config.service,
+        SpanAttributes.CODE_FUNCTION: func.__qualname__,
+        SpanAttributes.CODE_NAMESPACE: func.__module__,
+        SpanAttributes.CODE_FILEPATH: filepath,
+    }
+
+    def create_span():
+        return tracer.start_as_current_span(
+            name,
+            kind=SpanKind.INTERNAL,
+            attributes=attributes,
+            record_exception=True,
+            set_status_on_exception=True,
+            end_on_exit=True,
+        )
 
-def observe(func):
     @wraps(func)
     def _wrapper(*args, **kwargs):
-        with create_span(func):
-            return func(*args, **kwargs)
+        with create_span() as span:
+            result = func(*args, **kwargs)
+            span.set_status(StatusCode.OK)
+            return result
 
     @wraps(func)
     async def _awrapper(*args, **kwargs):
-        with create_span(func):
-            return await func(*args, **kwargs)
+        with create_span() as span:
+            result = await func(*args, **kwargs)
+            span.set_status(StatusCode.OK)
+            return result
 
     if inspect.iscoroutinefunction(func):
         return _awrapper
@@ -1,6 +1,13 @@
-from .sample_exception import SampleAlreadyExistsError, SampleNotFoundError
+from .database_exception import QueryBudgetExceededError
+from .sample_exception import (
+    SampleAlreadyExistsError,
+    SampleInvalidCursorError,
+    SampleNotFoundError,
+)
 
 __all__ = [
+    "QueryBudgetExceededError",
     "SampleAlreadyExistsError",
+    "SampleInvalidCursorError",
     "SampleNotFoundError",
 ]
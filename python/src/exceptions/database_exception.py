@@ -0,0 +1,8 @@
+class QueryBudgetExceededError(Exception):
+    def __init__(self, statements: int, limit: int):
+        self.status_code = 500
+        self.code = "D500"
+        self.message = (
+            f"Query budget exceeded: {statements} statements, limit {limit}"
+        )
+        super().__init__(self.message)
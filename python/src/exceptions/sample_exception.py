@@ -10,3 +10,10 @@ class SampleAlreadyExistsError(Exception):
         self.status_code = 409
         self.code = "S409"
         self.message = "Sample data already exists"
+
+
+class SampleInvalidCursorError(Exception):
+    def __init__(self):
+        self.status_code = 400
+        self.code = "S400"
+        self.message = "Sample cursor is invalid"
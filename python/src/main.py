@@ -1,30 +1,63 @@
+import argparse
+import os
+import sys
 from contextlib import asynccontextmanager
+from time import perf_counter
 
-import uvicorn
 from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
 from fastapi_pagination import add_pagination
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from src.dependencies import Environment
+from src.dependencies.compression import CompressionMiddleware
 from src.dependencies.config import Config, get_config
-from src.routers import HealthRouter, SampleRouter
-from src.schemas import Response
+from src.dependencies.database import (
+    QueryCountMiddleware,
+    ReadYourWritesMiddleware,
+)
+from src.dependencies.metrics import MetricsMiddleware
+from src.routers import HealthRouter, MetricsRouter, SampleRouter
+from src.schemas import FastJSONResponse, Response
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    from src.dependencies import database, logger, tracer
-
-    await logger.init()
-    await tracer.init()
-    await database.init()
-    yield
+    from src.dependencies import (
+        cache,
+        config,
+        database,
+        health,
+        http_client,
+        logger,
+        metrics,
+        single_flight,
+        tracer,
+    )
 
+    # initialized in order, disposed in reverse
+    modules = (
+        config,
+        logger,
+        tracer,
+        database,
+        cache,
+        single_flight,
+        http_client,
+        metrics,
+        health,
+    )
 
-config: Config = get_config()
+    app.state.startup_timings = {}
+    for module in modules:
+        start = perf_counter()
+        await module.init(app)
+        app.state.startup_timings[module.__name__] = perf_counter() - start
+    yield
+    for module in reversed(modules):
+        await module.dispose(app)
 
 
 title = "Service Name - Swagger UI"  # TODO: service name
@@ -53,12 +86,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryCountMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 # ===============
 # Routers
 # ===============
 app.include_router(HealthRouter)
+app.include_router(MetricsRouter)
 app.include_router(SampleRouter)
 
 
@@ -67,14 +105,14 @@ app.include_router(SampleRouter)
 # ===============
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(exc.detail, status_code=exc.status_code)
+    return FastJSONResponse(exc.detail, status_code=exc.status_code)
 
 
 # ===============
 # Base Routers
 # ===============
 @app.get("/docs", include_in_schema=False)
-async def swagger_ui_html():
+async def swagger_ui_html(config: Config):
     if config.environment == Environment.PRODUCTION:
         return Response(
             status=status.HTTP_404_NOT_FOUND, message="404 Not Found"
@@ -88,7 +126,7 @@ async def swagger_ui_html():
 
 
 @app.get("/", include_in_schema=False)
-async def home():
+async def home(config: Config):
     if config.environment == Environment.PRODUCTION:
         return Response(
             status=status.HTTP_404_NOT_FOUND, message="404 Not Found"
@@ -101,10 +139,58 @@ async def home():
 # WSGI
 # ===============
 def server():
+    parser = argparse.ArgumentParser(prog="app")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report import and lifespan timings instead of serving",
+    )
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        help="with --profile-startup, exit 1 above this many seconds",
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from src.profiling import profile_startup
+
+        sys.exit(profile_startup(app, args.startup_budget))
+
+    import uvicorn
+
+    config: Config = get_config()
+
+    if config.environment == Environment.DEVELOPMENT:
+        uvicorn.run(
+            app="src:app",
+            host=config.host,
+            port=config.port,
+            log_level=config.logging.level.lower(),
+            reload=True,
+        )
+        return
+
+    # workers > 1 pre-fork from one listening socket; SIGTERM stops
+    # accepting and drains in-flight requests before the lifespan ends
+    workers = config.server.workers or os.cpu_count() or 1
+
+    # only the multi-worker supervisor replaces a recycled worker; a single
+    # worker reaching the limit would shut the whole server down
+    limit_max_requests = None
+    if workers > 1:
+        limit_max_requests = config.server.limit_max_requests or None
+
     uvicorn.run(
         app="src:app",
         host=config.host,
         port=config.port,
         log_level=config.logging.level.lower(),
-        reload=True if config.environment == Environment.DEVELOPMENT else False,
+        workers=workers,
+        loop=config.server.loop,
+        http=config.server.http,
+        backlog=config.server.backlog,
+        timeout_keep_alive=config.server.keep_alive,
+        timeout_graceful_shutdown=config.server.graceful_shutdown,
+        limit_max_requests=limit_max_requests,
     )
@@ -1,13 +1,35 @@
 from .sample_model import (
     Sample,
+    SampleBatchGet,
+    SampleBatchResult,
+    SampleBulkDelete,
+    SampleBulkResult,
+    SampleBulkStatus,
+    SampleBulkUpdate,
     SampleCreate,
+    SampleExportFormat,
+    SampleFilter,
     SamplePublic,
+    SampleQuery,
+    SampleSortField,
     SampleUpdate,
+    SortOrder,
 )
 
 __all__ = [
     "Sample",
+    "SampleBatchGet",
+    "SampleBatchResult",
+    "SampleBulkDelete",
+    "SampleBulkResult",
+    "SampleBulkStatus",
+    "SampleBulkUpdate",
     "SampleCreate",
+    "SampleExportFormat",
+    "SampleFilter",
     "SamplePublic",
+    "SampleQuery",
+    "SampleSortField",
     "SampleUpdate",
+    "SortOrder",
 ]
@@ -1,6 +1,9 @@
 from datetime import datetime
+from enum import StrEnum, auto
 from uuid import UUID, uuid4
 
+from pydantic import model_validator
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -10,6 +13,18 @@ class SampleBase(SQLModel):
 
 class Sample(SampleBase, table=True):
     __tablename__: str = "samples"
+    __table_args__ = (
+        Index("ix_samples_created_at_id", "created_at", "id"),
+        Index("ix_samples_updated_at_id", "updated_at", "id"),
+        Index("ix_samples_name_id", "name", "id"),
+        # LIKE 'prefix%' can only use a btree index under the C collation
+        # or with the pattern operator class
+        Index(
+            "ix_samples_name_pattern",
+            "name",
+            postgresql_ops={"name": "text_pattern_ops"},
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.now)
@@ -29,3 +44,77 @@ class SamplePublic(SampleBase):
 
 class SampleUpdate(SampleBase):
     name: str | None = None
+
+
+class SampleBatchGet(SQLModel):
+    ids: list[UUID] = Field(min_length=1, max_length=1000)
+
+
+class SampleBatchResult(SQLModel):
+    samples: list[SamplePublic]
+    missing: list[UUID]
+
+
+class SampleBulkUpdate(SQLModel):
+    id: UUID
+    name: str
+
+
+class SampleFilter(SQLModel):
+    name: str | None = None
+    name_prefix: str | None = None
+    created_before: datetime | None = None
+    created_after: datetime | None = None
+    updated_before: datetime | None = None
+    updated_after: datetime | None = None
+
+
+class SampleSortField(StrEnum):
+    CREATED_AT = auto()
+    UPDATED_AT = auto()
+    NAME = auto()
+
+
+class SortOrder(StrEnum):
+    ASC = auto()
+    DESC = auto()
+
+
+class SampleQuery(SampleFilter):
+    sort: SampleSortField = SampleSortField.CREATED_AT
+    order: SortOrder = SortOrder.ASC
+
+
+class SampleBulkDelete(SQLModel):
+    ids: list[UUID] | None = None
+    filter: SampleFilter | None = None
+    # most rows a filter deletes per request
+    limit: int = Field(default=1000, ge=1, le=10_000)
+
+    @model_validator(mode="after")
+    def check_selector(self) -> "SampleBulkDelete":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("either ids or filter is required")
+        if self.filter is not None and not self.filter.model_dump(
+            exclude_none=True
+        ):
+            raise ValueError("filter needs at least one condition")
+        return self
+
+
+class SampleBulkStatus(StrEnum):
+    CREATED = auto()
+    UPDATED = auto()
+    DELETED = auto()
+    MISSING = auto()
+    CONFLICT = auto()
+
+
+class SampleExportFormat(StrEnum):
+    NDJSON = auto()
+    CSV = auto()
+
+
+class SampleBulkResult(SQLModel):
+    id: UUID
+    status: SampleBulkStatus
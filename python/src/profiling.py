@@ -0,0 +1,78 @@
+import asyncio
+import contextlib
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from fastapi import FastAPI
+
+# "import time: self [us] | cumulative | imported package"
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_timings(module: str = "src.main") -> tuple[float, dict[str, float]]:
+    """Import `module` in a fresh interpreter and return the total import
+    time and the time spent in each top-level package, in seconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0.0
+    packages: dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match is None:
+            continue
+
+        own, cumulative, indent, name = match.groups()
+        packages[name.split(".")[0]] += int(own) / 1e6
+        if not indent:
+            total += int(cumulative) / 1e6
+
+    return total, packages
+
+
+async def lifespan_timings(app: FastAPI) -> dict[str, float]:
+    async with app.router.lifespan_context(app):
+        return dict(app.state.startup_timings)
+
+
+def profile_startup(app: FastAPI, budget: float | None = None) -> int:
+    """Print where startup time goes and check it against `budget`.
+
+    Returns:
+        The exit status, 1 when startup took longer than `budget` seconds.
+    """
+    imports, packages = import_timings()
+
+    # the log writer binds stdout when the lifespan starts
+    with (
+        open(os.devnull, "w") as devnull,
+        contextlib.redirect_stdout(devnull),
+    ):
+        lifespan = asyncio.run(lifespan_timings(app))
+
+    print(f"{'imports':<32} {imports * 1e3:>9.1f} ms")
+    for name, seconds in sorted(
+        packages.items(), key=lambda package: package[1], reverse=True
+    )[:15]:
+        print(f"  {name:<30} {seconds * 1e3:>9.1f} ms")
+
+    print(f"{'lifespan':<32} {sum(lifespan.values()) * 1e3:>9.1f} ms")
+    for name, seconds in lifespan.items():
+        print(f"  {name:<30} {seconds * 1e3:>9.1f} ms")
+
+    total = imports + sum(lifespan.values())
+    print(f"{'total':<32} {total * 1e3:>9.1f} ms")
+
+    if budget is not None and total > budget:
+        print(
+            f"startup took {total:.3f}s, budget is {budget}s", file=sys.stderr
+        )
+        return 1
+    return 0
@@ -2,6 +2,8 @@ from sqlalchemy import select
 
 from src.dependencies import Database
 
+CHECK = select(1)
+
 
 class HealthRepository:
     db: Database
@@ -13,7 +15,7 @@ class HealthRepository:
         self,
     ) -> bool:
         try:
-            await self.db.exec(select(1))
+            await self.db.exec(CHECK)
             return True
-        except:
+        except Exception:
             return False
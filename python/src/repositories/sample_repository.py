@@ -1,18 +1,151 @@
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from uuid import UUID
 
+from fastapi import HTTPException
 from fastapi_pagination import Page
+from fastapi_pagination.api import (
+    apply_items_transformer,
+    create_page,
+    resolve_params,
+)
+from fastapi_pagination.cursor import CursorPage, CursorParams
 from fastapi_pagination.ext.async_sqlmodel import paginate
+from fastapi_pagination.types import ItemsTransformer
+from sqlalchemy import (
+    ColumnElement,
+    Executable,
+    Row,
+    Select,
+    String,
+    Uuid,
+    any_,
+    bindparam,
+    case,
+    column,
+    literal_column,
+    tuple_,
+    values,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlmodel import delete, select, update
 
 from src.dependencies import Database
-from src.exceptions import SampleAlreadyExistsError, SampleNotFoundError
+from src.exceptions import (
+    SampleAlreadyExistsError,
+    SampleInvalidCursorError,
+    SampleNotFoundError,
+)
 from src.models import (
     Sample,
+    SampleBulkResult,
+    SampleBulkStatus,
+    SampleBulkUpdate,
     SampleCreate,
+    SampleFilter,
+    SampleQuery,
+    SampleSortField,
     SampleUpdate,
+    SortOrder,
 )
 
+SORT_COLUMNS = {
+    SampleSortField.CREATED_AT: Sample.created_at,
+    SampleSortField.UPDATED_AT: Sample.updated_at,
+    SampleSortField.NAME: Sample.name,
+}
+
+
+def _bulk_results(
+    ids: list[UUID],
+    statuses: dict[UUID, SampleBulkStatus],
+    default: SampleBulkStatus,
+) -> list[SampleBulkResult]:
+    """One result per requested id, in request order; repeated ids are
+    only applied once and reported as conflicts."""
+    seen: set[UUID] = set()
+    results = []
+    for id in ids:
+        status = statuses.get(id, default)
+        if id in seen:
+            status = SampleBulkStatus.CONFLICT
+        seen.add(id)
+        results.append(SampleBulkResult(id=id, status=status))
+
+    return results
+
+
+def _filter_conditions(filter: SampleFilter) -> list[ColumnElement[bool]]:
+    conditions = []
+    if filter.name is not None:
+        conditions.append(Sample.name == filter.name)
+    if filter.name_prefix is not None:
+        conditions.append(
+            Sample.name.startswith(filter.name_prefix, autoescape=True)
+        )
+    if filter.created_before is not None:
+        conditions.append(Sample.created_at < filter.created_before)
+    if filter.created_after is not None:
+        conditions.append(Sample.created_at > filter.created_after)
+    if filter.updated_before is not None:
+        conditions.append(Sample.updated_at < filter.updated_before)
+    if filter.updated_after is not None:
+        conditions.append(Sample.updated_at > filter.updated_after)
+
+    return conditions
+
+
+def _ordering(query: SampleQuery) -> list[ColumnElement]:
+    # id breaks ties so pages stay stable, in the same direction as the
+    # sort column so one index serves both
+    columns = (SORT_COLUMNS[query.sort], Sample.id)
+    if query.order == SortOrder.DESC:
+        return [column.desc() for column in columns]
+
+    return [column.asc() for column in columns]
+
+
+def search(query: SampleQuery) -> Select:
+    """Samples matching `query`, in its order; every filter and sort is
+    backed by an index on `samples`."""
+    return (
+        select(Sample)
+        .where(*_filter_conditions(query))
+        .order_by(*_ordering(query))
+    )
+
+
+def _ids_condition(array: bool) -> ColumnElement[bool]:
+    if array:
+        # a single array parameter keeps one statement, and one cached
+        # plan, for any number of ids
+        return Sample.id == any_(bindparam("ids", type_=postgresql.ARRAY(Uuid)))
+
+    return Sample.id.in_(bindparam("ids", expanding=True))
+
+
+# Hot statements are built once: executing a prebuilt construct skips
+# rebuilding it and reuses its memoized cache key, so each call goes
+# straight to the compiled form in the engine's statement cache.
+READ_VERSION = select(Sample.id, Sample.updated_at).where(
+    Sample.id == bindparam("id")
+)
+DELETE = delete(Sample).where(Sample.id == bindparam("id"))
+# keyed by whether the dialect takes the ids as one array
+READ_MANY = {
+    array: select(Sample).where(_ids_condition(array))
+    for array in (True, False)
+}
+DELETE_MANY = {
+    array: delete(Sample)
+    .where(_ids_condition(array))
+    .returning(Sample.id)
+    .execution_options(synchronize_session=False)
+    for array in (True, False)
+}
+
 
 class SampleRepository:
     db: Database
@@ -20,6 +153,12 @@ class SampleRepository:
     def __init__(self, db: Database) -> None:
         self.db = db
 
+    def _many(
+        self,
+        statements: dict[bool, Executable],
+    ) -> Executable:
+        return statements[self.db.get_bind().dialect.name == "postgresql"]
+
     async def create(
         self,
         sample: SampleCreate,
@@ -29,33 +168,283 @@ class SampleRepository:
             data = data.model_validate(sample)
             self.db.add(data)
             await self.db.commit()
-            await self.db.refresh(data)
         except IntegrityError:
             raise SampleAlreadyExistsError()
 
         return data
 
+    async def create_bulk(
+        self,
+        samples: list[SampleCreate],
+        upsert: bool = False,
+        chunk_size: int = 1000,
+    ) -> list[SampleBulkResult]:
+        dialect = self.db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+        rows: dict[UUID, dict] = {}
+        for sample in samples:
+            rows.setdefault(
+                sample.id, Sample.model_validate(sample).model_dump()
+            )
+
+        statuses: dict[UUID, SampleBulkStatus] = {}
+        values = list(rows.values())
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start : start + chunk_size]
+            query = insert(Sample).values(chunk)
+
+            if not upsert:
+                query = query.on_conflict_do_nothing(index_elements=["id"])
+                result = await self.db.execute(query.returning(Sample.id))
+                statuses |= dict.fromkeys(
+                    result.scalars(), SampleBulkStatus.CREATED
+                )
+                continue
+
+            query = query.on_conflict_do_update(
+                index_elements=["id"],
+                set_={
+                    "name": query.excluded.name,
+                    "updated_at": query.excluded.updated_at,
+                },
+            )
+            if dialect == "postgresql":
+                # xmax is only zero on freshly inserted row versions
+                result = await self.db.execute(
+                    query.returning(Sample.id, literal_column("xmax") == 0)
+                )
+                created = dict(result.tuples().all())
+            else:
+                ids = [row["id"] for row in chunk]
+                existing = set(
+                    await self.db.scalars(
+                        select(Sample.id).where(Sample.id.in_(ids))
+                    )
+                )
+                await self.db.execute(query)
+                created = {id: id not in existing for id in ids}
+
+            statuses |= {
+                id: SampleBulkStatus.CREATED
+                if is_new
+                else SampleBulkStatus.UPDATED
+                for id, is_new in created.items()
+            }
+
+        await self.db.commit()
+
+        return _bulk_results(
+            [sample.id for sample in samples],
+            statuses,
+            SampleBulkStatus.CONFLICT,
+        )
+
+    async def update_bulk(
+        self,
+        samples: list[SampleBulkUpdate],
+        chunk_size: int = 1000,
+    ) -> list[SampleBulkResult]:
+        dialect = self.db.get_bind().dialect.name
+
+        changes: dict[UUID, str] = {}
+        for sample in samples:
+            changes.setdefault(sample.id, sample.name)
+
+        updated: set[UUID] = set()
+        items = list(changes.items())
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start : start + chunk_size]
+            query = update(Sample)
+
+            if dialect == "postgresql":
+                rows = values(
+                    column("id", Uuid), column("name", String), name="changes"
+                ).data(chunk)
+                query = query.where(Sample.id == rows.c.id).values(
+                    name=rows.c.name
+                )
+            else:
+                # SQLite cannot name the columns of VALUES in FROM
+                query = query.where(
+                    Sample.id.in_([id for id, _ in chunk])
+                ).values(name=case(dict(chunk), value=Sample.id))
+
+            result = await self.db.execute(
+                query.returning(Sample.id).execution_options(
+                    synchronize_session=False
+                )
+            )
+            updated.update(result.scalars())
+
+        await self.db.commit()
+
+        return _bulk_results(
+            [sample.id for sample in samples],
+            dict.fromkeys(updated, SampleBulkStatus.UPDATED),
+            SampleBulkStatus.MISSING,
+        )
+
+    async def delete_bulk(
+        self,
+        ids: list[UUID],
+        chunk_size: int = 1000,
+    ) -> list[SampleBulkResult]:
+        deleted: set[UUID] = set()
+        unique = list(dict.fromkeys(ids))
+        for start in range(0, len(unique), chunk_size):
+            result = await self.db.execute(
+                self._many(DELETE_MANY),
+                {"ids": unique[start : start + chunk_size]},
+            )
+            deleted.update(result.scalars())
+
+        await self.db.commit()
+
+        return _bulk_results(
+            ids,
+            dict.fromkeys(deleted, SampleBulkStatus.DELETED),
+            SampleBulkStatus.MISSING,
+        )
+
+    async def delete_where(
+        self,
+        filter: SampleFilter,
+        limit: int,
+    ) -> list[SampleBulkResult]:
+        """Delete at most `limit` of the oldest samples matching `filter`;
+        callers repeat until fewer than `limit` come back."""
+        matching = (
+            select(Sample.id)
+            .where(*_filter_conditions(filter))
+            .order_by(Sample.created_at, Sample.id)
+            .limit(limit)
+        )
+        result = await self.db.execute(
+            delete(Sample)
+            .where(Sample.id.in_(matching))
+            .returning(Sample.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = list(result.scalars())
+
+        await self.db.commit()
+
+        return [
+            SampleBulkResult(id=id, status=SampleBulkStatus.DELETED)
+            for id in deleted
+        ]
+
     async def read_all(
         self,
+        query: SampleQuery,
+        transformer: ItemsTransformer | None = None,
     ) -> Page[Sample]:
         return await paginate(
             self.db,
-            select(Sample),
+            search(query),
+            transformer=transformer,
         )
 
-    async def read(
+    async def read_all_cursor(
         self,
-        id: UUID,
-    ) -> Sample | None:
+        filter: SampleFilter,
+        transformer: ItemsTransformer | None = None,
+    ) -> CursorPage[Sample]:
+        params: CursorParams = resolve_params()
         try:
-            result = (
-                await self.db.exec(
-                    select(Sample).where(Sample.id == id),
+            raw_params = params.to_raw_params()
+        except (HTTPException, ValueError):
+            # not base64, or not text once decoded
+            raise SampleInvalidCursorError()
+        key = tuple_(Sample.created_at, Sample.id)
+
+        backwards = False
+        query = select(Sample).where(*_filter_conditions(filter))
+        if raw_params.cursor:
+            try:
+                direction, created_at, id = json.loads(raw_params.cursor)
+                backwards = direction == "prev"
+                bookmark = tuple_(datetime.fromisoformat(created_at), UUID(id))
+            except (AttributeError, TypeError, ValueError):
+                raise SampleInvalidCursorError()
+
+            query = query.where(key < bookmark if backwards else key > bookmark)
+
+        if backwards:
+            query = query.order_by(Sample.created_at.desc(), Sample.id.desc())
+        else:
+            query = query.order_by(Sample.created_at, Sample.id)
+
+        items = list(
+            (await self.db.exec(query.limit(raw_params.size + 1))).all()
+        )
+        has_more = len(items) > raw_params.size
+        items = items[: raw_params.size]
+        if backwards:
+            items.reverse()
+
+        def cursor(direction: str, sample: Sample) -> str:
+            return json.dumps(
+                [direction, sample.created_at.isoformat(), str(sample.id)]
+            )
+
+        has_next = has_more if not backwards else bool(raw_params.cursor)
+        has_previous = has_more if backwards else bool(raw_params.cursor)
+
+        next_ = cursor("next", items[-1]) if items and has_next else None
+        previous = cursor("prev", items[0]) if items and has_previous else None
+        if transformer is not None:
+            items = await apply_items_transformer(
+                items, transformer, async_=True
+            )
+
+        return create_page(
+            items,
+            params=params,
+            next_=next_,
+            previous=previous,
+        )
+
+    async def stream(
+        self,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        # a dedicated connection outlives the request-scoped session
+        async with self.db.bind.connect() as conn:
+            result = await conn.stream(
+                select(
+                    Sample.id,
+                    Sample.name,
+                    Sample.created_at,
+                    Sample.updated_at,
                 )
-            ).one()
-            await self.db.refresh(result)
+                .order_by(Sample.created_at, Sample.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            async for rows in result.partitions():
+                yield rows
+
+    async def read_many(
+        self,
+        ids: Sequence[UUID],
+    ) -> dict[UUID, Sample]:
+        samples = (
+            await self.db.exec(self._many(READ_MANY), params={"ids": list(ids)})
+        ).all()
+
+        return {sample.id: sample for sample in samples}
+
+    async def read_version(
+        self,
+        id: UUID,
+    ) -> Row:
+        """Only `id` and `updated_at`, enough to answer a conditional
+        request without loading the row."""
+        try:
+            result = (await self.db.exec(READ_VERSION, params={"id": id})).one()
         except NoResultFound:
-            raise SampleAlreadyExistsError()
+            raise SampleNotFoundError()
 
         return result
 
@@ -64,21 +453,24 @@ class SampleRepository:
         id: UUID,
         sample: SampleUpdate,
     ) -> Sample:
-        result = (
-            await self.db.scalars(
-                update(Sample)
-                .where(Sample.id == id)
-                .values(sample.model_dump(exclude_none=True))
-                .returning(Sample),
-            )
-        ).one()
+        try:
+            result = (
+                await self.db.scalars(
+                    update(Sample)
+                    .where(Sample.id == id)
+                    .values(sample.model_dump(exclude_none=True))
+                    .returning(Sample),
+                )
+            ).one()
+        except NoResultFound:
+            raise SampleNotFoundError()
+
         await self.db.commit()
-        await self.db.refresh(result)
         return result
 
     async def delete(
         self,
         sample: Sample,
     ) -> None:
-        await self.db.exec(delete(Sample).where(Sample.id == sample.id))
+        await self.db.exec(DELETE, params={"id": sample.id})
         await self.db.commit()
@@ -1,7 +1,9 @@
 from .health_router import router as HealthRouter
+from .metrics_router import router as MetricsRouter
 from .sample_router import router as SampleRouter
 
 __all__ = [
     "HealthRouter",
+    "MetricsRouter",
     "SampleRouter",
 ]
@@ -1,8 +1,9 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, status
+from fastapi import Response as HttpResponse
 
-from src.schemas import HealthCheck
+from src.schemas import HealthCheck, Readiness
 from src.services import HealthService
 
 router = APIRouter(
@@ -29,3 +30,47 @@ async def health(
         HealthCheck: Returns a JSON response with the health status
     """
     return await health_service.check()
+
+
+@router.get(
+    "/health/live",
+    summary="Liveness Probe",
+    response_description="Return HTTP Status Code 200 (OK)",
+    status_code=status.HTTP_200_OK,
+)
+async def live(
+    health_service: Annotated[HealthService, Depends()],
+) -> HealthCheck:
+    """
+    ## Liveness Probe
+    Answers as long as the process is serving requests, without touching
+    any dependency.
+    Returns:
+        HealthCheck: Returns a JSON response with the version
+    """
+    return await health_service.live()
+
+
+@router.get(
+    "/health/ready",
+    summary="Readiness Probe",
+    response_description="Return HTTP Status Code 200 (OK) or 503",
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": Readiness}},
+)
+async def ready(
+    response: HttpResponse,
+    health_service: Annotated[HealthService, Depends()],
+) -> Readiness:
+    """
+    ## Readiness Probe
+    Serves the latest result of the background database probe. Returns
+    503 while the database is unreachable or slower than the configured
+    latency, or while the pool is saturated beyond its threshold.
+    Returns:
+        Readiness: Returns a JSON response with the reasons for being unready
+    """
+    readiness = await health_service.ready()
+    if readiness.reasons:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
@@ -0,0 +1,34 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import PlainTextResponse
+
+from src.dependencies.metrics import CONTENT_TYPE
+from src.services import MetricsService
+
+router = APIRouter(
+    tags=["metrics"],
+)
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus Metrics",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def metrics(
+    metrics_service: Annotated[MetricsService, Depends()],
+) -> PlainTextResponse:
+    """
+    ## Prometheus Metrics
+    Request latency histograms, in-flight requests, event-loop lag,
+    database pool, cache and outbound HTTP client counters in the
+    Prometheus text exposition format.
+    """
+    if metrics_service.metrics is None:
+        return PlainTextResponse(
+            "metrics are disabled\n", status_code=status.HTTP_404_NOT_FOUND
+        )
+
+    return PlainTextResponse(metrics_service.render(), media_type=CONTENT_TYPE)
@@ -2,15 +2,26 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import Response as HttpResponse
 from fastapi_pagination import Page
+from fastapi_pagination.cursor import CursorPage
 
-from src.dependencies import Logger, tracer
+from src.dependencies import Conditional, Logger, tracer
+from src.dependencies.conditional import etag, not_modified, validators
 from src.models import (
+    SampleBatchGet,
+    SampleBatchResult,
+    SampleBulkDelete,
+    SampleBulkResult,
+    SampleBulkUpdate,
     SampleCreate,
+    SampleExportFormat,
+    SampleFilter,
     SamplePublic,
+    SampleQuery,
     SampleUpdate,
 )
-from src.schemas import Response
+from src.schemas import ClosingStreamingResponse, FastJSONResponse, Response
 from src.services import SampleService
 
 router = APIRouter(
@@ -19,13 +30,13 @@ router = APIRouter(
 )
 
 
-@router.post("/")
+@router.post("/", response_model=Response[SamplePublic])
 @tracer.observe
 async def create(
     logger: Logger,
     sample_service: Annotated[SampleService, Depends()],
     sample: SampleCreate,
-) -> Response[SamplePublic]:
+) -> FastJSONResponse:
     try:
         data = await sample_service.create(sample)
     except Exception as error:
@@ -37,7 +48,7 @@ async def create(
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     message=str(error),
                     data=None,
-                ).model_dump(),
+                ),
             )
         raise HTTPException(
             status_code=error.status_code,
@@ -45,33 +56,271 @@ async def create(
                 status=error.status_code,
                 message=f"{error.code}: {error.message}",
                 data=None,
-            ).model_dump(),
+            ),
         )
 
-    return Response(
-        status=status.HTTP_200_OK,
-        message="Sample created successfully",
-        data=data,
+    return FastJSONResponse(
+        Response[SamplePublic](
+            status=status.HTTP_200_OK,
+            message="Sample created successfully",
+            data=data,
+        )
+    )
+
+
+@router.post("/bulk", response_model=Response[list[SampleBulkResult]])
+@tracer.observe
+async def create_bulk(
+    logger: Logger,
+    sample_service: Annotated[SampleService, Depends()],
+    samples: list[SampleCreate],
+    upsert: bool = False,
+) -> FastJSONResponse:
+    try:
+        data = await sample_service.create_bulk(samples, upsert=upsert)
+    except Exception as error:
+        logger.error(error, exc_info=True)
+        if not hasattr(error, "status_code"):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=Response(
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    message=str(error),
+                    data=None,
+                ),
+            )
+        raise HTTPException(
+            status_code=error.status_code,
+            detail=Response(
+                status=error.status_code,
+                message=f"{error.code}: {error.message}",
+                data=None,
+            ),
+        )
+
+    return FastJSONResponse(
+        Response[list[SampleBulkResult]](
+            status=status.HTTP_200_OK,
+            message="Samples written successfully",
+            data=data,
+        )
+    )
+
+
+@router.patch("/bulk", response_model=Response[list[SampleBulkResult]])
+@tracer.observe
+async def update_bulk(
+    logger: Logger,
+    sample_service: Annotated[SampleService, Depends()],
+    samples: list[SampleBulkUpdate],
+) -> FastJSONResponse:
+    try:
+        data = await sample_service.update_bulk(samples)
+    except Exception as error:
+        logger.error(error, exc_info=True)
+        if not hasattr(error, "status_code"):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=Response(
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    message=str(error),
+                    data=None,
+                ),
+            )
+        raise HTTPException(
+            status_code=error.status_code,
+            detail=Response(
+                status=error.status_code,
+                message=f"{error.code}: {error.message}",
+                data=None,
+            ),
+        )
+
+    return FastJSONResponse(
+        Response[list[SampleBulkResult]](
+            status=status.HTTP_200_OK,
+            message="Samples updated successfully",
+            data=data,
+        )
+    )
+
+
+@router.delete("/bulk", response_model=Response[list[SampleBulkResult]])
+@tracer.observe
+async def delete_bulk(
+    logger: Logger,
+    sample_service: Annotated[SampleService, Depends()],
+    batch: SampleBulkDelete,
+) -> FastJSONResponse:
+    try:
+        data = await sample_service.delete_bulk(batch)
+    except Exception as error:
+        logger.error(error, exc_info=True)
+        if not hasattr(error, "status_code"):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=Response(
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    message=str(error),
+                    data=None,
+                ),
+            )
+        raise HTTPException(
+            status_code=error.status_code,
+            detail=Response(
+                status=error.status_code,
+                message=f"{error.code}: {error.message}",
+                data=None,
+            ),
+        )
+
+    return FastJSONResponse(
+        Response[list[SampleBulkResult]](
+            status=status.HTTP_200_OK,
+            message="Samples deleted successfully",
+            data=data,
+        )
+    )
+
+
+@router.post(":batchGet", response_model=Response[SampleBatchResult])
+@tracer.observe
+async def batch_get(
+    logger: Logger,
+    sample_service: Annotated[SampleService, Depends()],
+    batch: SampleBatchGet,
+) -> FastJSONResponse:
+    try:
+        data = await sample_service.read_many(batch.ids)
+    except Exception as error:
+        logger.error(error, exc_info=True)
+        if not hasattr(error, "status_code"):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=Response(
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    message=str(error),
+                    data=None,
+                ),
+            )
+        raise HTTPException(
+            status_code=error.status_code,
+            detail=Response(
+                status=error.status_code,
+                message=f"{error.code}: {error.message}",
+                data=None,
+            ),
+        )
+
+    return FastJSONResponse(
+        Response[SampleBatchResult](
+            status=status.HTTP_200_OK,
+            message="Success",
+            data=data,
+        )
     )
 
 
-@router.get("/")
+@router.get("/", response_model=Page[SamplePublic])
 @tracer.observe
 async def read_all(
     logger: Logger,
     sample_service: Annotated[SampleService, Depends()],
-) -> Page[SamplePublic]:
-    return await sample_service.read_all()
+    conditional: Conditional,
+    response: HttpResponse,
+    query: Annotated[SampleQuery, Depends()],
+) -> Page[SamplePublic] | HttpResponse:
+    page, items_etag = await sample_service.read_all(query)
 
+    headers = {
+        "ETag": etag(items_etag, page.total, page.page, page.size),
+        "Cache-Control": "no-cache",
+    }
+    if conditional.not_modified(headers["ETag"]):
+        return not_modified(headers)
 
-@router.get("/{id}")
+    response.headers.update(headers)
+    return page
+
+
+@router.get("/cursor", response_model=CursorPage[SamplePublic])
+@tracer.observe
+async def read_all_cursor(
+    logger: Logger,
+    sample_service: Annotated[SampleService, Depends()],
+    conditional: Conditional,
+    response: HttpResponse,
+    filter: Annotated[SampleFilter, Depends()],
+) -> CursorPage[SamplePublic] | HttpResponse:
+    try:
+        page, items_etag = await sample_service.read_all_cursor(filter)
+    except Exception as error:
+        logger.error(error, exc_info=True)
+        if not hasattr(error, "status_code"):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=Response(
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    message=str(error),
+                    data=None,
+                ),
+            )
+        raise HTTPException(
+            status_code=error.status_code,
+            detail=Response(
+                status=error.status_code,
+                message=f"{error.code}: {error.message}",
+                data=None,
+            ),
+        )
+
+    headers = {
+        "ETag": etag(items_etag, page.next_page, page.previous_page),
+        "Cache-Control": "no-cache",
+    }
+    if conditional.not_modified(headers["ETag"]):
+        return not_modified(headers)
+
+    response.headers.update(headers)
+    return page
+
+
+@router.get("/export")
+@tracer.observe
+async def export(
+    sample_service: Annotated[SampleService, Depends()],
+    format: SampleExportFormat = SampleExportFormat.NDJSON,
+) -> ClosingStreamingResponse:
+    return ClosingStreamingResponse(
+        sample_service.export(format),
+        media_type=(
+            "text/csv"
+            if format == SampleExportFormat.CSV
+            else "application/x-ndjson"
+        ),
+        headers={
+            "Content-Disposition": f"attachment; filename=samples.{format}"
+        },
+    )
+
+
+@router.get("/{id}", response_model=Response[SamplePublic])
 @tracer.observe
 async def read(
     logger: Logger,
     sample_service: Annotated[SampleService, Depends()],
+    conditional: Conditional,
     id: UUID,
-) -> Response[SamplePublic]:
+) -> FastJSONResponse | HttpResponse:
     try:
+        # a conditional request only needs the version; the row is loaded
+        # and serialized when the client's copy is stale
+        if conditional:
+            version = await sample_service.read_version(id)
+            headers = validators(version)
+            if conditional.not_modified(headers["ETag"], version.updated_at):
+                return not_modified(headers)
+
         data = await sample_service.read(id)
     except Exception as error:
         logger.error(error, exc_info=True)
@@ -82,7 +331,7 @@ async def read(
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     message=str(error),
                     data=None,
-                ).model_dump(),
+                ),
             )
         raise HTTPException(
             status_code=error.status_code,
@@ -90,24 +339,27 @@ async def read(
                 status=error.status_code,
                 message=f"{error.code}: {error.message}",
                 data=None,
-            ).model_dump(),
+            ),
         )
 
-    return Response(
-        status=status.HTTP_200_OK,
-        message="Success",
-        data=data,
+    return FastJSONResponse(
+        Response[SamplePublic](
+            status=status.HTTP_200_OK,
+            message="Success",
+            data=data,
+        ),
+        headers=validators(data),
     )
 
 
-@router.patch("/{id}")
+@router.patch("/{id}", response_model=Response[SamplePublic])
 @tracer.observe
 async def update(
     logger: Logger,
     sample_service: Annotated[SampleService, Depends()],
     id: UUID,
     sample: SampleUpdate,
-) -> Response[SamplePublic]:
+) -> FastJSONResponse:
     try:
         data = await sample_service.update(id, sample)
     except Exception as error:
@@ -119,7 +371,7 @@ async def update(
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     message=str(error),
                     data=None,
-                ).model_dump(),
+                ),
             )
         raise HTTPException(
             status_code=error.status_code,
@@ -127,26 +379,29 @@ async def update(
                 status=error.status_code,
                 message=f"{error.code}: {error.message}",
                 data=None,
-            ).model_dump(),
+            ),
         )
 
-    return Response(
-        status=status.HTTP_200_OK,
-        message="Successfully updated",
-        data=data,
+    return FastJSONResponse(
+        Response[SamplePublic](
+            status=status.HTTP_200_OK,
+            message="Successfully updated",
+            data=data,
+        )
     )
 
 
 @router.delete(
     "/{id}",
     status_code=status.HTTP_200_OK,
+    response_model=Response,
 )
 @tracer.observe
 async def delete(
     logger: Logger,
     sample_service: Annotated[SampleService, Depends()],
     id: UUID,
-) -> Response:
+) -> FastJSONResponse:
     try:
         await sample_service.delete(id)
     except Exception as error:
@@ -158,7 +413,7 @@ async def delete(
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     message=str(error),
                     data=None,
-                ).model_dump(),
+                ),
             )
         raise HTTPException(
             status_code=error.status_code,
@@ -166,11 +421,13 @@ async def delete(
                 status=error.status_code,
                 message=f"{error.code}: {error.message}",
                 data=None,
-            ).model_dump(),
+            ),
         )
 
-    return Response(
-        status=status.HTTP_200_OK,
-        message="Successfully deleted",
-        data=None,
+    return FastJSONResponse(
+        Response(
+            status=status.HTTP_200_OK,
+            message="Successfully deleted",
+            data=None,
+        )
     )
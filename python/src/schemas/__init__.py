@@ -1,4 +1,23 @@
-from .health_schema import HealthCheck
-from .response_schema import Response
+from .health_schema import (
+    CacheStatus,
+    HealthCheck,
+    HttpClientStatus,
+    PoolStatus,
+    Readiness,
+)
+from .response_schema import (
+    ClosingStreamingResponse,
+    FastJSONResponse,
+    Response,
+)
 
-__all__ = ["HealthCheck", "Response"]
+__all__ = [
+    "CacheStatus",
+    "ClosingStreamingResponse",
+    "FastJSONResponse",
+    "HealthCheck",
+    "HttpClientStatus",
+    "PoolStatus",
+    "Readiness",
+    "Response",
+]
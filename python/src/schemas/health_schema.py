@@ -1,8 +1,58 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
+class PoolStatus(BaseModel):
+    """Database connection pool saturation and checkout wait times."""
+
+    size: int = 0
+    checked_out: int = 0
+    overflow: int = 0
+    saturation: float = 0.0
+    checkouts: int = 0
+    wait_avg: float = 0.0
+    wait_max: float = 0.0
+
+
+class CacheStatus(BaseModel):
+    """Cache backend hit, miss and eviction counters."""
+
+    backend: str = ""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    hit_ratio: float = 0.0
+
+
+class HttpClientStatus(BaseModel):
+    """Outbound HTTP connection pool usage and retry counters."""
+
+    connections: int = 0
+    active: int = 0
+    idle: int = 0
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+
+
 class HealthCheck(BaseModel):
     """Response model to validate and return when performing a health check."""
 
     status: str = "OK"
     version: str = ""
+    pool: PoolStatus | None = None
+    cache: CacheStatus | None = None
+    http_client: HttpClientStatus | None = None
+
+
+class Readiness(BaseModel):
+    """Response model for the readiness probe, served from the latest
+    background check."""
+
+    status: str = "OK"
+    version: str = ""
+    database_latency: float | None = None
+    pool_saturation: float = 0.0
+    reasons: list[str] = []
+    checked_at: datetime | None = None
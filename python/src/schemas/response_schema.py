@@ -1,6 +1,9 @@
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar
 
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.types import Receive, Scope, Send
 
 T = TypeVar("T")
 
@@ -9,3 +12,34 @@ class Response(BaseModel, Generic[T]):
     status: int = 200
     message: str = ""
     data: T | None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core.
+
+    Models are written by the serializer pydantic compiles once per model
+    class, and returning this from a route skips FastAPI's response_model
+    validation, so a `Response[T]` is validated once when it is built and
+    serialized once here.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """Streaming response that closes its body generator however the
+    response ends.
+
+    Starlette stops iterating when the client disconnects but leaves the
+    generator suspended until garbage collection, along with whatever it
+    holds open, such as a database connection.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
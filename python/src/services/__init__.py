@@ -1,7 +1,9 @@
 from .health_service import HealthService
+from .metrics_service import MetricsService
 from .sample_service import SampleService
 
 __all__ = [
     "HealthService",
+    "MetricsService",
     "SampleService",
 ]
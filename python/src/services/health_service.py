@@ -1,31 +1,63 @@
-from importlib import metadata
-from typing import Annotated
-
-from fastapi import Depends
-
-from src.dependencies import Config
-from src.repositories import HealthRepository
-from src.schemas import HealthCheck
+from src.dependencies import Cache, Engine, HttpTransport, Pool
+from src.dependencies.health import Health
+from src.schemas import (
+    CacheStatus,
+    HealthCheck,
+    HttpClientStatus,
+    PoolStatus,
+    Readiness,
+)
 
 
 class HealthService:
-    config: Config
-    health_repository: HealthRepository
+    engine: Engine
+    pool: Pool
+    cache: Cache
+    http_transport: HttpTransport
+    health: Health
 
     def __init__(
         self,
-        config: Config,
-        health_repository: Annotated[HealthRepository, Depends()],
+        engine: Engine,
+        pool: Pool,
+        cache: Cache,
+        http_transport: HttpTransport,
+        health: Health,
     ) -> None:
-        self.config = config
-        self.health_repository = health_repository
+        self.engine = engine
+        self.pool = pool
+        self.cache = cache
+        self.http_transport = http_transport
+        self.health = health
 
     async def check(
         self,
     ) -> HealthCheck:
         health_check = HealthCheck()
         health_check.status = "HANANABUBU"
-        if await self.health_repository.check():
+        if self.health.database:
             health_check.status = "OK"
-        health_check.version = metadata.version(self.config.service)
+        health_check.version = self.health.version
+        health_check.pool = PoolStatus(**self.pool.status(self.engine))
+        health_check.cache = CacheStatus(**self.cache.status())
+        health_check.http_client = HttpClientStatus(
+            **self.http_transport.status()
+        )
         return health_check
+
+    async def live(
+        self,
+    ) -> HealthCheck:
+        return HealthCheck(version=self.health.version)
+
+    async def ready(
+        self,
+    ) -> Readiness:
+        return Readiness(
+            status="OK" if self.health.ready else "UNAVAILABLE",
+            version=self.health.version,
+            database_latency=self.health.database_latency,
+            pool_saturation=self.health.pool_saturation,
+            reasons=self.health.reasons,
+            checked_at=self.health.checked_at,
+        )
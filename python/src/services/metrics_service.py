@@ -0,0 +1,142 @@
+from src.dependencies import (
+    Cache,
+    Engine,
+    HttpTransport,
+    Metrics,
+    Pool,
+    SingleFlight,
+    StatementCache,
+)
+from src.dependencies.metrics import metric
+
+
+class MetricsService:
+    metrics: Metrics
+    engine: Engine
+    pool: Pool
+    cache: Cache
+    http_transport: HttpTransport
+    single_flight: SingleFlight
+    statement_cache: StatementCache
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        engine: Engine,
+        pool: Pool,
+        cache: Cache,
+        http_transport: HttpTransport,
+        single_flight: SingleFlight,
+        statement_cache: StatementCache,
+    ) -> None:
+        self.metrics = metrics
+        self.engine = engine
+        self.pool = pool
+        self.cache = cache
+        self.http_transport = http_transport
+        self.single_flight = single_flight
+        self.statement_cache = statement_cache
+
+    def render(
+        self,
+    ) -> str:
+        pool = self.pool.status(self.engine)
+        cache = self.cache.status()
+        http_client = self.http_transport.status()
+        backend = {"backend": cache["backend"]}
+
+        lines = self.metrics.render()
+        lines += metric(
+            "db_pool_size",
+            "gauge",
+            "Connections kept in the pool.",
+            pool["size"],
+        )
+        lines += metric(
+            "db_pool_checked_out",
+            "gauge",
+            "Connections currently checked out.",
+            pool["checked_out"],
+        )
+        lines += metric(
+            "db_pool_overflow",
+            "gauge",
+            "Connections opened beyond the pool size.",
+            pool["overflow"],
+        )
+        lines += metric(
+            "db_pool_checkouts_total",
+            "counter",
+            "Sessions that checked out a connection.",
+            pool["checkouts"],
+        )
+        lines += metric(
+            "db_pool_checkout_wait_seconds_total",
+            "counter",
+            "Time spent waiting for a pooled connection.",
+            self.pool.wait_total,
+        )
+        lines += metric(
+            "db_pool_checkout_wait_max_seconds",
+            "gauge",
+            "Longest wait for a pooled connection.",
+            pool["wait_max"],
+        )
+        statement_cache = self.statement_cache.status()
+        lines += metric(
+            "db_statement_cache_total",
+            "counter",
+            "Executed statements by compiled-cache lookup result.",
+            [
+                ({"result": result}, statement_cache[result])
+                for result in self.statement_cache.results
+            ],
+        )
+        lines += metric(
+            "db_statement_cache_hit_ratio",
+            "gauge",
+            "Share of cacheable statements found already compiled.",
+            statement_cache["hit_ratio"],
+        )
+        for name in ("hits", "misses", "evictions"):
+            lines += metric(
+                f"cache_{name}_total",
+                "counter",
+                f"Cache {name}.",
+                [(backend, cache[name])],
+            )
+        lines += metric(
+            "http_client_connections",
+            "gauge",
+            "Outbound connections by state.",
+            [
+                ({"state": "active"}, http_client["active"]),
+                ({"state": "idle"}, http_client["idle"]),
+            ],
+        )
+        for name in ("requests", "retries", "failures"):
+            lines += metric(
+                f"http_client_{name}_total",
+                "counter",
+                f"Outbound {name}.",
+                http_client[name],
+            )
+
+        single_flight = self.single_flight.status()
+        lines += metric(
+            "single_flight_calls_total",
+            "counter",
+            "Reads that ran a query or joined one already in flight.",
+            [
+                ({"outcome": "executed"}, single_flight["executed"]),
+                ({"outcome": "coalesced"}, single_flight["coalesced"]),
+            ],
+        )
+        lines += metric(
+            "single_flight_in_flight",
+            "gauge",
+            "Shared reads currently in flight.",
+            single_flight["in_flight"],
+        )
+
+        return "\n".join(lines) + "\n"
@@ -1,26 +1,98 @@
+import asyncio
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from contextlib import aclosing
 from typing import Annotated
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi_pagination import Page
+from fastapi_pagination.cursor import CursorPage
+from pydantic_core import from_json
+from sqlalchemy import Row
 from sqlalchemy.exc import IntegrityError
 
+from src.dependencies import Cache, Config, SingleFlight
+from src.dependencies.batch_loader import BatchLoader
+from src.dependencies.conditional import collection_etag
+from src.dependencies.database import SESSION_REPLICA_LAG
+from src.exceptions import SampleNotFoundError
 from src.models import (
     Sample,
+    SampleBatchResult,
+    SampleBulkDelete,
+    SampleBulkResult,
+    SampleBulkStatus,
+    SampleBulkUpdate,
     SampleCreate,
+    SampleExportFormat,
+    SampleFilter,
+    SampleQuery,
     SampleUpdate,
 )
 from src.repositories import SampleRepository
 
+EXPORT_FIELDS = ("id", "name", "created_at", "updated_at")
+
+
+def _export_row(row: Row) -> tuple[str, str, str, str]:
+    return (
+        str(row.id),
+        row.name,
+        row.created_at.isoformat(),
+        row.updated_at.isoformat(),
+    )
+
+
+def _cache_key(id: UUID) -> str:
+    return f"sample:{id}"
+
+
+def _from_cache(cached: bytes) -> Sample:
+    # model_validate_json skips validation on table models and would leave
+    # the timestamps as strings
+    return Sample.model_validate(from_json(cached))
+
+
+class _Versions:
+    """Pagination transformer that takes the ETag of a page's items while
+    they still carry `updated_at`, before they become `SamplePublic`."""
+
+    etag: str
+
+    def __init__(self) -> None:
+        self.etag = collection_etag([])
+
+    def __call__(self, items: Sequence[Sample]) -> Sequence[Sample]:
+        self.etag = collection_etag(items)
+        return items
+
 
 class SampleService:
+    config: Config
+    cache: Cache
+    single_flight: SingleFlight
     sample_repository: SampleRepository
+    loader: BatchLoader
 
     def __init__(
         self,
+        config: Config,
+        cache: Cache,
+        single_flight: SingleFlight,
         sample_repository: Annotated[SampleRepository, Depends()],
     ) -> None:
+        self.config = config
+        self.cache = cache
+        self.single_flight = single_flight
         self.sample_repository = sample_repository
+        # the service lives for one request, and so does its loader
+        self.loader = BatchLoader(
+            sample_repository.read_many,
+            max_batch_size=config.database.bulk_chunk_size,
+        )
 
     async def create(
         self,
@@ -30,26 +102,231 @@ class SampleService:
 
         return sample
 
+    async def create_bulk(
+        self,
+        samples: list[SampleCreate],
+        upsert: bool = False,
+    ) -> list[SampleBulkResult]:
+        results = await self.sample_repository.create_bulk(
+            samples,
+            upsert=upsert,
+            chunk_size=self.config.database.bulk_chunk_size,
+        )
+
+        await self.cache.delete(
+            *(
+                _cache_key(result.id)
+                for result in results
+                if result.status == SampleBulkStatus.UPDATED
+            )
+        )
+
+        return results
+
+    async def update_bulk(
+        self,
+        samples: list[SampleBulkUpdate],
+    ) -> list[SampleBulkResult]:
+        results = await self.sample_repository.update_bulk(
+            samples,
+            chunk_size=self.config.database.bulk_chunk_size,
+        )
+
+        await self.cache.delete(
+            *(
+                _cache_key(result.id)
+                for result in results
+                if result.status == SampleBulkStatus.UPDATED
+            )
+        )
+
+        return results
+
+    async def delete_bulk(
+        self,
+        batch: SampleBulkDelete,
+    ) -> list[SampleBulkResult]:
+        if batch.ids is not None:
+            results = await self.sample_repository.delete_bulk(
+                batch.ids,
+                chunk_size=self.config.database.bulk_chunk_size,
+            )
+        else:
+            results = await self.sample_repository.delete_where(
+                batch.filter,
+                limit=batch.limit,
+            )
+
+        await self.cache.delete(
+            *(
+                _cache_key(result.id)
+                for result in results
+                if result.status == SampleBulkStatus.DELETED
+            )
+        )
+
+        return results
+
     async def read_all(
         self,
-    ) -> Page[Sample]:
-        return await self.sample_repository.read_all()
+        query: SampleQuery,
+    ) -> tuple[Page[Sample], str]:
+        versions = _Versions()
+        page = await self.sample_repository.read_all(
+            query, transformer=versions
+        )
+
+        return page, versions.etag
+
+    async def read_all_cursor(
+        self,
+        filter: SampleFilter,
+    ) -> tuple[CursorPage[Sample], str]:
+        versions = _Versions()
+        page = await self.sample_repository.read_all_cursor(
+            filter, transformer=versions
+        )
+
+        return page, versions.etag
+
+    async def export(
+        self,
+        format: SampleExportFormat,
+    ) -> AsyncIterator[str]:
+        # closed with this generator, so a disconnect that closes the
+        # export also returns the cursor's connection right away
+        async with aclosing(
+            self.sample_repository.stream(
+                chunk_size=self.config.database.stream_chunk_size,
+            )
+        ) as chunks:
+            if format == SampleExportFormat.NDJSON:
+                async for rows in chunks:
+                    yield "".join(
+                        json.dumps(dict(zip(EXPORT_FIELDS, _export_row(row))))
+                        + "\n"
+                        for row in rows
+                    )
+                return
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            async for rows in chunks:
+                writer.writerows(_export_row(row) for row in rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
 
     async def read(
         self,
         id: UUID,
+    ) -> Sample:
+        cached = await self.cache.get(_cache_key(id))
+        if cached is not None:
+            return _from_cache(cached)
+
+        # concurrent misses for one id share a single query
+        sample = await self.single_flight.do(
+            self._flight_key(_cache_key(id)), lambda: self._read_through(id)
+        )
+        if sample is None:
+            raise SampleNotFoundError()
+
+        return sample
+
+    async def read_many(
+        self,
+        ids: list[UUID],
+    ) -> SampleBatchResult:
+        ids = list(dict.fromkeys(ids))
+
+        cached = await asyncio.gather(
+            *(self.cache.get(_cache_key(id)) for id in ids)
+        )
+        samples = {
+            id: _from_cache(value)
+            for id, value in zip(ids, cached, strict=True)
+            if value is not None
+        }
+
+        # every miss is resolved by the same query
+        misses = [id for id in ids if id not in samples]
+        loaded = {
+            id: sample
+            for id, sample in zip(
+                misses, await self.loader.load_many(misses), strict=True
+            )
+            if sample is not None
+        }
+        if self._cacheable():
+            await asyncio.gather(
+                *(
+                    self.cache.add(
+                        _cache_key(id), sample.model_dump_json().encode()
+                    )
+                    for id, sample in loaded.items()
+                )
+            )
+        samples |= loaded
+
+        return SampleBatchResult(
+            samples=[samples[id] for id in ids if id in samples],
+            missing=[id for id in ids if id not in samples],
+        )
+
+    async def read_version(
+        self,
+        id: UUID,
+    ) -> Sample | Row:
+        cached = await self.cache.get(_cache_key(id))
+        if cached is not None:
+            return _from_cache(cached)
+
+        return await self.single_flight.do(
+            self._flight_key(f"{_cache_key(id)}:version"),
+            lambda: self.sample_repository.read_version(id),
+        )
+
+    async def _read_through(
+        self,
+        id: UUID,
     ) -> Sample | None:
-        return await self.sample_repository.read(id=id)
+        sample = await self.loader.load(id)
+        if sample is not None and self._cacheable():
+            await self.cache.add(
+                _cache_key(id), sample.model_dump_json().encode()
+            )
+
+        return sample
+
+    def _flight_key(self, key: str) -> str:
+        # a read pinned to the primary must not share the answer of a flight
+        # started on a replica, which may not have its write yet
+        if SESSION_REPLICA_LAG in self.sample_repository.db.info:
+            return f"{key}:replica"
+        return key
+
+    def _cacheable(self) -> bool:
+        # a lagging replica can still return the row a write just replaced,
+        # and caching it would undo that write's invalidation until the TTL
+        lag = self.sample_repository.db.info.get(SESSION_REPLICA_LAG)
+        return lag is None or lag <= self.config.database.replica_cache_max_lag
 
     async def update(
         self,
         id: UUID,
         sample: SampleUpdate,
     ) -> Sample:
-        return await self.sample_repository.update(id, sample)
+        sample = await self.sample_repository.update(id, sample)
+        await self.cache.delete(_cache_key(id))
+
+        return sample
 
     async def delete(
         self,
         id: UUID,
     ) -> None:
-        return await self.sample_repository.delete(Sample(id=id))
+        await self.sample_repository.delete(Sample(id=id))
+        await self.cache.delete(_cache_key(id))
@@ -0,0 +1,64 @@
+import os
+import tempfile
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+# the config snapshot is taken when src is first imported, so the test
+# settings must be in the environment before that
+_directory = Path(tempfile.mkdtemp(prefix="service-tests-"))
+os.environ.setdefault(
+    "DATABASE__URL", f"sqlite+aiosqlite:///{_directory / 'test.db'}"
+)
+os.environ.setdefault("DATABASE__CREATE_ALL", "true")
+os.environ.setdefault("TRACING__EXPORTER", "memory")
+os.environ.setdefault("CACHE__BACKEND", "memory")
+os.environ.setdefault("HOT_RELOAD", "false")
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.dependencies.config import Config, get_config
+from src.main import app as _app
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    # every test shares the loop the app's lifespan was started on
+    marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(marker, append=False)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app() -> AsyncIterator[FastAPI]:
+    """The application with its lifespan run once for the whole session;
+    the tracer provider can only be installed once per process."""
+    async with _app.router.lifespan_context(_app):
+        yield _app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app: FastAPI) -> AsyncIterator[AsyncClient]:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def override_config(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Callable[..., Config]:
+    """Makes `get_config` in a module return the test snapshot with some of
+    its fields replaced, for the duration of the test."""
+
+    def override(module: ModuleType, **fields: Any) -> Config:
+        config = get_config().model_copy(update=fields)
+        monkeypatch.setattr(module, "get_config", lambda: config)
+        return config
+
+    return override
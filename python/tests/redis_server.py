@@ -0,0 +1,135 @@
+"""In-process stand-in for Redis speaking just enough RESP2 for RedisCache
+on redis-py: GET, SET (with EX, PX and NX), DEL, AUTH, SELECT, PING and
+CLIENT.
+
+Faults are switched on per test: `hang` reads commands and never answers,
+`drop` sends half a reply and closes the connection, and `failing` names
+commands answered with an error.
+"""
+
+import asyncio
+import time
+
+
+class RedisServer:
+    data: dict[bytes, bytes]
+    expires: dict[bytes, float]
+    connections: int
+    active: int
+    peak: int
+    hang: bool
+    drop: bool
+    failing: set[bytes]
+    server: asyncio.Server
+    writers: set[asyncio.StreamWriter]
+    handlers: set[asyncio.Task]
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.expires = {}
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+        self.hang = False
+        self.drop = False
+        self.failing = set()
+        self.writers = set()
+        self.handlers = set()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self.server.close()
+        for writer in self.writers:
+            writer.close()
+        await asyncio.gather(*self.handlers)
+        await self.server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        self.writers.add(writer)
+        self.handlers.add(asyncio.current_task())
+        try:
+            while command := await self._read_command(reader):
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                try:
+                    if self.hang:
+                        # never answer; wait for the client to give up
+                        await reader.read()
+                        return
+                    if self.drop:
+                        writer.write(b"$5\r\nhal")
+                        await writer.drain()
+                        return
+                    # yield once so concurrent commands overlap
+                    await asyncio.sleep(0)
+                    writer.write(self._reply(command))
+                    await writer.drain()
+                finally:
+                    self.active -= 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def _read_command(
+        self, reader: asyncio.StreamReader
+    ) -> list[bytes] | None:
+        line = await reader.readline()
+        if not line:
+            return None
+
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    def _reply(self, command: list[bytes]) -> bytes:
+        name, *args = command
+        name = name.upper()
+
+        if name in self.failing:
+            return b"-ERR injected failure\r\n"
+        if name in (b"AUTH", b"SELECT", b"CLIENT"):
+            return b"+OK\r\n"
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name == b"GET":
+            value = self.get(args[0])
+            if value is None:
+                return b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"SET":
+            key, value, *options = args
+            options = [option.upper() for option in options]
+            if b"NX" in options and self.get(key) is not None:
+                return b"$-1\r\n"
+            self.data[key] = value
+            self.expires.pop(key, None)
+            for unit, scale in ((b"EX", 1), (b"PX", 1e-3)):
+                if unit in options:
+                    ttl = int(options[options.index(unit) + 1]) * scale
+                    self.expires[key] = time.monotonic() + ttl
+            return b"+OK\r\n"
+        if name == b"DEL":
+            deleted = sum(self.data.pop(key, None) is not None for key in args)
+            return b":%d\r\n" % deleted
+
+        return b"-ERR unknown command\r\n"
+
+    def get(self, key: bytes) -> bytes | None:
+        if self.expires.get(key, float("inf")) < time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
@@ -0,0 +1,97 @@
+import asyncio
+from collections.abc import Hashable
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src.dependencies.batch_loader import BatchLoader
+from src.repositories import SampleRepository
+from tests.test_sample_router import create_samples
+
+
+async def test_loads_in_one_tick_share_a_batch() -> None:
+    batches = []
+
+    async def batch(keys: list[Hashable]) -> dict[Hashable, str]:
+        batches.append(keys)
+        return {key: f"value {key}" for key in keys if key != "missing"}
+
+    loader = BatchLoader(batch, max_batch_size=2)
+
+    values = await loader.load_many(["one", "two", "one", "missing"])
+
+    assert values == ["value one", "value two", "value one", None]
+    assert batches == [["one", "two"], ["missing"]]
+
+
+async def test_error_reaches_every_caller() -> None:
+    error = ValueError("failed")
+
+    async def batch(keys: list[Hashable]) -> dict[Hashable, str]:
+        raise error
+
+    loader = BatchLoader(batch)
+
+    results = await asyncio.gather(
+        loader.load("one"), loader.load("two"), return_exceptions=True
+    )
+
+    assert results == [error, error]
+
+
+async def test_caller_retries_when_the_batch_is_cancelled_under_it() -> None:
+    started = asyncio.Event()
+    batches = []
+
+    async def batch(keys: list[Hashable]) -> dict[Hashable, str]:
+        batches.append(keys)
+        if len(batches) == 1:
+            started.set()
+            await asyncio.Event().wait()
+        return {key: "value" for key in keys}
+
+    loader = BatchLoader(batch)
+    leader = asyncio.create_task(loader.load("one"))
+    follower = asyncio.create_task(loader.load("two"))
+    await started.wait()
+
+    leader.cancel()
+
+    assert await follower == "value"
+    assert leader.cancelled()
+    assert batches == [["one", "two"], ["two"]]
+
+
+async def test_cancelled_read_releases_the_connection(
+    app: FastAPI, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (id,) = await create_samples(client, 1)
+    pool = app.state.engine.pool
+    querying, release, done = asyncio.Event(), asyncio.Event(), asyncio.Event()
+    read_many = SampleRepository.read_many
+
+    async def slow(self: SampleRepository, ids):
+        querying.set()
+        await release.wait()
+        samples = await read_many(self, ids)
+        # a long query keeps its connection checked out
+        await done.wait()
+        return samples
+
+    monkeypatch.setattr(SampleRepository, "read_many", slow)
+
+    # the client goes away while the batch query runs
+    read = asyncio.create_task(client.get(f"/samples/{id}"))
+    await querying.wait()
+    read.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await read
+
+    # a batch outliving the request would go on to query the closed
+    # session, which checks out a connection nothing returns
+    release.set()
+    await asyncio.sleep(0.1)
+    checkedout = pool.checkedout()
+    done.set()
+    assert checkedout == 0
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src.dependencies.cache import TOMBSTONE, BaseCache, MemoryCache, RedisCache
+from src.repositories import SampleRepository
+from tests.redis_server import RedisServer
+from tests.test_sample_router import create_samples
+
+TIMEOUT = 0.2
+TOMBSTONE_TTL = 0.1
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[RedisServer]:
+    server = RedisServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def redis(server: RedisServer) -> AsyncIterator[RedisCache]:
+    cache = RedisCache(
+        server.url,
+        ttl=60,
+        tombstone_ttl=TOMBSTONE_TTL,
+        timeout=TIMEOUT,
+        pool_size=2,
+    )
+    yield cache
+    await cache.close()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request: pytest.FixtureRequest) -> BaseCache:
+    if request.param == "memory":
+        return MemoryCache(100, ttl=60, tombstone_ttl=TOMBSTONE_TTL)
+    return request.getfixturevalue("redis")
+
+
+async def test_round_trip(cache: BaseCache) -> None:
+    await cache.add("key", b"value")
+
+    assert await cache.get("key") == b"value"
+    await cache.delete("key")
+    assert await cache.get("key") is None
+    assert cache.status()["hits"] == 1
+
+
+async def test_add_keeps_a_live_entry(cache: BaseCache) -> None:
+    await cache.add("key", b"first")
+    await cache.add("key", b"second")
+
+    assert await cache.get("key") == b"first"
+
+
+async def test_tombstone_blocks_fills_until_it_expires(
+    cache: BaseCache,
+) -> None:
+    await cache.add("key", b"old")
+    await cache.delete("key")
+
+    # a read that loaded the row before the write fills after it
+    await cache.add("key", b"old")
+    assert await cache.get("key") is None
+
+    await asyncio.sleep(TOMBSTONE_TTL * 2)
+    await cache.add("key", b"new")
+    assert await cache.get("key") == b"new"
+
+
+async def test_hanging_server_is_a_miss_within_the_timeout(
+    server: RedisServer, redis: RedisCache
+) -> None:
+    await redis.add("key", b"value")
+    server.hang = True
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(redis.get("key") for _ in range(4)))
+
+    assert results == [None] * 4
+    # every command gives up after one timeout, waiting for a slot included
+    assert time.monotonic() - started < 2 * TIMEOUT
+
+    server.hang = False
+    assert await redis.get("key") == b"value"
+
+
+async def test_reply_cut_short_is_a_miss(
+    server: RedisServer, redis: RedisCache
+) -> None:
+    await redis.add("key", b"value")
+    server.drop = True
+
+    assert await redis.get("key") is None
+
+    server.drop = False
+    assert await redis.get("key") == b"value"
+
+
+async def test_connection_dropped_while_idle_is_replaced(
+    server: RedisServer, redis: RedisCache
+) -> None:
+    await redis.add("key", b"value")
+    for writer in list(server.writers):
+        writer.close()
+    await asyncio.sleep(0)
+
+    assert await redis.get("key") == b"value"
+    assert server.connections == 2
+
+
+async def test_pool_bounds_connections(
+    server: RedisServer, redis: RedisCache
+) -> None:
+    await asyncio.gather(*(redis.add(f"key{n}", b"value") for n in range(20)))
+    await asyncio.gather(*(redis.get(f"key{n}") for n in range(20)))
+
+    assert server.peak == 2
+    assert server.connections == 2
+
+
+async def test_failed_invalidation_is_retried_before_the_next_read(
+    server: RedisServer, redis: RedisCache
+) -> None:
+    await redis.add("key", b"stale")
+    server.failing.add(b"SET")
+
+    await redis.delete("key")
+
+    assert redis.stale == {"key"}
+    # the entry may be stale, so it is not served while the retry is due
+    assert await redis.get("key") is None
+
+    server.failing.clear()
+    assert await redis.get("other") is None
+    assert redis.stale == set()
+    assert server.get(b"key") == TOMBSTONE
+
+
+async def test_read_racing_an_update_does_not_cache_the_old_row(
+    app: FastAPI, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (id,) = await create_samples(client, 1)
+    loaded, release = asyncio.Event(), asyncio.Event()
+    read_many = SampleRepository.read_many
+
+    async def paused(self: SampleRepository, ids):
+        samples = await read_many(self, ids)
+        loaded.set()
+        await release.wait()
+        return samples
+
+    monkeypatch.setattr(SampleRepository, "read_many", paused)
+
+    # the read loads the row, then the update commits and invalidates
+    # before the read gets to fill the cache
+    read = asyncio.create_task(client.get(f"/samples/{id}"))
+    await loaded.wait()
+    monkeypatch.setattr(SampleRepository, "read_many", read_many)
+    update = await client.patch(f"/samples/{id}", json={"name": "renamed"})
+    release.set()
+
+    assert update.status_code == 200
+    assert (await read).json()["data"]["name"] != "renamed"
+    response = await client.get(f"/samples/{id}")
+    assert response.json()["data"]["name"] == "renamed"
@@ -0,0 +1,182 @@
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from starlette.datastructures import Headers
+from starlette.types import Message, Receive, Scope, Send
+
+from src.dependencies import compression
+from src.dependencies.compression import CompressionMiddleware, negotiate
+from src.dependencies.config import Compression, Config, ContentEncoding
+
+BODY = b'{"name": "sample"}' * 100
+ENCODINGS = sorted(compression.supported())
+
+
+def decompressor(encoding: ContentEncoding) -> Callable[[bytes], bytes]:
+    """Decompresses a stream one chunk at a time."""
+    if encoding == ContentEncoding.GZIP:
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == ContentEncoding.BR:
+        import brotli
+
+        return brotli.Decompressor().process
+    import zstandard
+
+    return zstandard.ZstdDecompressor().decompressobj().decompress
+
+
+def respond(
+    *chunks: bytes,
+    status: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Callable:
+    headers = {"content-type": "application/json", **(headers or {})}
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (name.encode(), value.encode())
+                    for name, value in headers.items()
+                ],
+            }
+        )
+        for n, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": n < len(chunks) - 1,
+                }
+            )
+
+    return app
+
+
+async def call(
+    app: Callable,
+    accept_encoding: str = "gzip",
+    method: str = "GET",
+    send: Send | None = None,
+) -> tuple[Headers, list[bytes]]:
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def collect(message: Message) -> None:
+        messages.append(message)
+        if send is not None:
+            await send(message)
+
+    scope: dict[str, Any] = {
+        "type": "http",
+        "method": method,
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    await CompressionMiddleware(app)(scope, receive, collect)
+
+    start, *bodies = messages
+    return Headers(raw=start["headers"]), [body["body"] for body in bodies]
+
+
+@pytest.fixture(autouse=True)
+def settings(override_config: Callable[..., Config]) -> None:
+    override_config(compression, compression=Compression(minimum_size=100))
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, br;q=0.5", ContentEncoding.GZIP),
+        ("zstd;q=0.1, gzip", ContentEncoding.GZIP),
+        # ties go to the server's order
+        ("gzip;q=0.8, br;q=0.8", ContentEncoding.BR),
+        ("*;q=0.5, zstd;q=0", ContentEncoding.BR),
+        ("GZIP", ContentEncoding.GZIP),
+        ("gzip;q=0", None),
+        ("gzip;q=high", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(
+    accept_encoding: str, expected: ContentEncoding | None
+) -> None:
+    assert negotiate(accept_encoding, tuple(ContentEncoding)) == expected
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+async def test_compresses_with_each_encoding(
+    encoding: ContentEncoding,
+) -> None:
+    headers, (body,) = await call(
+        respond(BODY, headers={"content-length": str(len(BODY))}), encoding
+    )
+
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["content-length"] == str(len(body))
+    assert decompressor(encoding)(body) == BODY
+
+
+async def test_small_body_is_left_alone() -> None:
+    headers, (body,) = await call(respond(BODY[:99]))
+
+    assert "content-encoding" not in headers
+    # the response would be compressed were it larger
+    assert headers["vary"] == "Accept-Encoding"
+    assert body == BODY[:99]
+
+
+@pytest.mark.parametrize(
+    ("app", "method"),
+    [
+        (respond(BODY, headers={"content-encoding": "br"}), "GET"),
+        (respond(BODY, status=304), "GET"),
+        (respond(BODY, headers={"content-type": "image/png"}), "GET"),
+        (respond(b"", headers={"content-length": str(len(BODY))}), "HEAD"),
+    ],
+    ids=["encoded", "not modified", "binary", "head"],
+)
+async def test_skipped(app: Callable, method: str) -> None:
+    headers, bodies = await call(app, method=method)
+
+    assert headers.get("content-encoding", "br") == "br"
+    assert "vary" not in headers
+    assert b"".join(bodies) in (BODY, b"")
+
+
+async def test_unaccepted_encoding_is_left_alone() -> None:
+    headers, (body,) = await call(respond(BODY), accept_encoding="identity")
+
+    assert "content-encoding" not in headers
+    assert body == BODY
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+async def test_streamed_chunks_are_sent_as_they_come(
+    encoding: ContentEncoding,
+) -> None:
+    chunks = [b"small" * n for n in range(1, 5)]
+    decompress = decompressor(encoding)
+    received = []
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            received.append(decompress(message["body"]))
+
+    headers, bodies = await call(
+        respond(*chunks), accept_encoding=encoding, send=send
+    )
+
+    assert headers["content-encoding"] == encoding
+    assert "content-length" not in headers
+    # every chunk decompresses on its own, none is held back for the next
+    assert received == chunks
+    assert len(bodies) == len(chunks)
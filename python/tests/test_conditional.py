@@ -0,0 +1,153 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from tests.test_sample_router import create_samples
+
+
+async def validators(client: AsyncClient, id: str) -> tuple[str, str]:
+    response = await client.get(f"/samples/{id}")
+    assert response.status_code == 200
+    return response.headers["etag"], response.headers["last-modified"]
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [
+        "{etag}",
+        "*",
+        # If-None-Match compares weakly, so the strong form matches too
+        "{strong}",
+        '"other", {etag}',
+    ],
+)
+async def test_matching_tag_is_not_modified(
+    client: AsyncClient, if_none_match: str
+) -> None:
+    (id,) = await create_samples(client, 1)
+    tag, last_modified = await validators(client, id)
+
+    response = await client.get(
+        f"/samples/{id}",
+        headers={
+            "If-None-Match": if_none_match.format(
+                etag=tag, strong=tag.removeprefix("W/")
+            )
+        },
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == tag
+    assert response.headers["last-modified"] == last_modified
+
+
+async def test_other_tag_is_modified(client: AsyncClient) -> None:
+    (id,) = await create_samples(client, 1)
+
+    response = await client.get(
+        f"/samples/{id}", headers={"If-None-Match": 'W/"other"'}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"]["id"] == id
+
+
+async def test_if_modified_since(client: AsyncClient) -> None:
+    (id,) = await create_samples(client, 1)
+    _, last_modified = await validators(client, id)
+    earlier = format_datetime(
+        datetime.now(UTC) - timedelta(days=1), usegmt=True
+    )
+
+    unchanged = await client.get(
+        f"/samples/{id}", headers={"If-Modified-Since": last_modified}
+    )
+    changed = await client.get(
+        f"/samples/{id}", headers={"If-Modified-Since": earlier}
+    )
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+
+
+async def test_if_modified_since_is_ignored_with_if_none_match(
+    client: AsyncClient,
+) -> None:
+    (id,) = await create_samples(client, 1)
+    _, last_modified = await validators(client, id)
+
+    response = await client.get(
+        f"/samples/{id}",
+        headers={
+            "If-None-Match": 'W/"other"',
+            "If-Modified-Since": last_modified,
+        },
+    )
+
+    assert response.status_code == 200
+
+
+async def test_not_modified_only_reads_the_version(
+    app: FastAPI, client: AsyncClient
+) -> None:
+    (id,) = await create_samples(client, 1)
+    tag, _ = await validators(client, id)
+    # a miss, so the version comes from the database
+    await app.state.cache.delete(f"sample:{id}")
+
+    response = await client.get(
+        f"/samples/{id}", headers={"If-None-Match": tag}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["x-query-count"] == "1"
+
+
+async def test_page_tag_changes_when_an_item_is_updated(
+    client: AsyncClient,
+) -> None:
+    prefix = uuid.uuid4().hex
+    ids = [str(uuid.uuid4()) for _ in range(2)]
+    for id in ids:
+        response = await client.post(
+            "/samples/", json={"id": id, "name": f"{prefix} {id}"}
+        )
+        assert response.status_code == 200
+    params = {"name_prefix": prefix}
+
+    first = await client.get("/samples/", params=params)
+    tag = first.headers["etag"]
+    unchanged = await client.get(
+        "/samples/", params=params, headers={"If-None-Match": tag}
+    )
+    await client.patch(f"/samples/{ids[0]}", json={"name": f"{prefix} new"})
+    changed = await client.get(
+        "/samples/", params=params, headers={"If-None-Match": tag}
+    )
+
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != tag
+    assert {item["name"] for item in changed.json()["items"]} == {
+        f"{prefix} new",
+        f"{prefix} {ids[1]}",
+    }
+
+
+async def test_cursor_page_is_not_modified(client: AsyncClient) -> None:
+    await create_samples(client, 2)
+    params = {"size": 2}
+    tag = (await client.get("/samples/cursor", params=params)).headers["etag"]
+
+    response = await client.get(
+        "/samples/cursor", params=params, headers={"If-None-Match": tag}
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
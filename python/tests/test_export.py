@@ -0,0 +1,76 @@
+import asyncio
+import csv
+import io
+import json
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.requests import ClientDisconnect
+
+from tests.test_sample_router import create_samples
+
+
+async def test_ndjson(client: AsyncClient) -> None:
+    ids = await create_samples(client, 3)
+
+    response = await client.get("/samples/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert set(ids) <= {row["id"] for row in rows}
+    assert set(rows[0]) == {"id", "name", "created_at", "updated_at"}
+
+
+async def test_csv(client: AsyncClient) -> None:
+    ids = await create_samples(client, 3)
+
+    response = await client.get("/samples/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert set(ids) <= {row["id"] for row in rows}
+
+
+@pytest.mark.parametrize("format", ["ndjson", "csv"])
+async def test_disconnect_releases_the_connection(
+    app: FastAPI, client: AsyncClient, format: str
+) -> None:
+    await create_samples(client, 3)
+    pool = app.state.engine.pool
+    disconnected = asyncio.Event()
+
+    async def receive() -> dict[str, Any]:
+        if not disconnected.is_set():
+            disconnected.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message: dict[str, Any]) -> None:
+        # the client goes away as soon as the first rows arrive
+        if message["type"] == "http.response.body":
+            raise OSError("connection reset")
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/samples/export",
+        "raw_path": b"/samples/export",
+        "root_path": "",
+        "query_string": f"format={format}".encode(),
+        "headers": [(b"host", b"test")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("test", 80),
+    }
+
+    with pytest.raises((ClientDisconnect, OSError)):
+        await app(scope, receive, send)
+
+    # released on disconnect, not whenever the generator is collected
+    assert pool.checkedout() == 0
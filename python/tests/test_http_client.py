@@ -0,0 +1,153 @@
+import asyncio
+import random
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from src.dependencies import http_client
+from src.dependencies.config import Config, HttpClient
+
+
+def transport(
+    override_config: Callable[..., Config],
+    handler: Callable[[httpx.Request], httpx.Response],
+    **settings,
+) -> http_client.RetryTransport:
+    # no waiting between attempts unless a test asks for a backoff
+    settings.setdefault("backoff", 0)
+    override_config(http_client, http_client=HttpClient(**settings))
+    return http_client.create_transport(transport=httpx.MockTransport(handler))
+
+
+def responses(*outcomes: int | Exception) -> Callable:
+    """A handler answering each call with the next status, or raising."""
+    remaining = list(outcomes)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        outcome = remaining.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome)
+
+    return handler
+
+
+@pytest.mark.parametrize("status", [502, 503, 504])
+async def test_retries_idempotent_requests(
+    override_config: Callable[..., Config], status: int
+) -> None:
+    retrying = transport(override_config, responses(status, status, 200))
+
+    async with httpx.AsyncClient(transport=retrying) as client:
+        response = await client.get("http://upstream/")
+
+    assert response.status_code == 200
+    assert retrying.status()["retries"] == 2
+
+
+async def test_gives_up_after_the_retries(
+    override_config: Callable[..., Config],
+) -> None:
+    retrying = transport(override_config, responses(503, 503, 503), retries=2)
+
+    async with httpx.AsyncClient(transport=retrying) as client:
+        response = await client.put("http://upstream/")
+
+    assert response.status_code == 503
+    assert retrying.status()["retries"] == 2
+
+
+async def test_does_not_retry_non_idempotent_requests(
+    override_config: Callable[..., Config],
+) -> None:
+    retrying = transport(override_config, responses(503, 200))
+
+    async with httpx.AsyncClient(transport=retrying) as client:
+        response = await client.post("http://upstream/", json={})
+
+    assert response.status_code == 503
+    assert retrying.status()["retries"] == 0
+
+
+async def test_retries_connect_errors_for_every_method(
+    override_config: Callable[..., Config],
+) -> None:
+    # the request never reached the server, so even a POST is safe
+    retrying = transport(
+        override_config, responses(httpx.ConnectError("refused"), 200)
+    )
+
+    async with httpx.AsyncClient(transport=retrying) as client:
+        response = await client.post("http://upstream/", json={})
+
+    assert response.status_code == 200
+    assert retrying.status()["retries"] == 1
+
+
+async def test_raises_connect_errors_after_the_retries(
+    override_config: Callable[..., Config],
+) -> None:
+    error = httpx.ConnectError("refused")
+    retrying = transport(override_config, responses(error, error), retries=1)
+
+    async with httpx.AsyncClient(transport=retrying) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("http://upstream/")
+
+    assert retrying.status()["failures"] == 1
+
+
+async def test_backoff_is_capped(
+    monkeypatch: pytest.MonkeyPatch, override_config: Callable[..., Config]
+) -> None:
+    retrying = transport(
+        override_config,
+        responses(*[503] * 5, 200),
+        retries=5,
+        backoff=1,
+        backoff_max=3,
+    )
+
+    # record each jittered delay's upper bound and skip the sleep
+    bounds = []
+    monkeypatch.setattr(
+        random, "uniform", lambda low, high: bounds.append(high) or 0
+    )
+
+    async with httpx.AsyncClient(transport=retrying) as client:
+        await client.get("http://upstream/")
+
+    assert bounds == [1, 2, 3, 3, 3]
+
+
+async def test_pool_reuses_connections_across_calls() -> None:
+    connections = 0
+
+    async def serve(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        nonlocal connections
+        connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+
+    pooled = http_client.create_transport()
+    async with http_client.create_client(pooled) as client:
+        for _ in range(5):
+            response = await client.get(f"http://{host}:{port}/")
+            assert response.text == "ok"
+
+        assert pooled.status()["connections"] == 1
+        assert pooled.status()["requests"] == 5
+
+    server.close()
+    await server.wait_closed()
+    assert connections == 1
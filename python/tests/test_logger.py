@@ -0,0 +1,146 @@
+import io
+import logging
+import threading
+from queue import SimpleQueue
+
+import pytest
+
+from src.dependencies import logger
+from src.dependencies.logger import (
+    BatchQueueListener,
+    RateLimitFilter,
+    SamplingFilter,
+)
+
+
+def record(
+    name: str = "service", level: int = logging.INFO, msg: str = "message"
+) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 0, msg, None, None)
+
+
+class Clock:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(logger.time, "monotonic", clock)
+    return clock
+
+
+def test_sampling_uses_the_closest_configured_logger(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(logger.random, "random", lambda: 0.5)
+    sampling = SamplingFilter({"service": 0.0, "service.http": 0.75})
+
+    assert not sampling.filter(record("service.db"))
+    assert sampling.filter(record("service.http.client"))
+    assert sampling.filter(record("other"))
+
+
+def test_sampling_keeps_warnings() -> None:
+    sampling = SamplingFilter({"service": 0.0})
+
+    assert sampling.filter(record(level=logging.WARNING))
+    assert not sampling.filter(record(level=logging.DEBUG))
+
+
+def test_rate_limit_drops_repeats_within_the_interval(clock: Clock) -> None:
+    rate_limit = RateLimitFilter(limit=2, interval=60)
+
+    kept = [rate_limit.filter(record()) for _ in range(5)]
+
+    assert kept == [True, True, False, False, False]
+    # a different message or level has a window of its own
+    assert rate_limit.filter(record(msg="other"))
+    assert rate_limit.filter(record(level=logging.ERROR))
+
+
+def test_rate_limit_reports_the_suppressed_count(clock: Clock) -> None:
+    rate_limit = RateLimitFilter(limit=1, interval=60)
+    for _ in range(4):
+        rate_limit.filter(record())
+
+    clock.now = 60
+    first = record()
+    assert rate_limit.filter(first)
+    assert first.labels == {"suppressed": "3"}
+
+    # nothing was dropped in the window that just ended
+    clock.now = 120
+    second = record()
+    assert rate_limit.filter(second)
+    assert not hasattr(second, "labels")
+
+
+def test_rate_limit_counts_across_threads() -> None:
+    rate_limit = RateLimitFilter(limit=100, interval=60)
+    kept = []
+
+    def log() -> None:
+        kept.extend(rate_limit.filter(record()) for _ in range(500))
+
+    threads = [threading.Thread(target=log) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert kept.count(True) == 100
+    assert rate_limit.windows[("service", logging.INFO, "message")][2] == 3900
+
+
+class Stream(io.StringIO):
+    writes: int = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+def test_batch_writer_writes_each_batch_once() -> None:
+    stream = Stream()
+    queue = SimpleQueue()
+    for n in range(5):
+        queue.put(record(msg=f"line {n}"))
+
+    listener = BatchQueueListener(
+        queue, lambda: logging.StreamHandler(stream), batch_size=3
+    )
+    listener.start()
+    listener.stop()
+
+    assert stream.getvalue().splitlines() == [f"line {n}" for n in range(5)]
+    # two records wait with the sentinel, so five records take two writes
+    assert stream.writes == 2
+
+
+def test_batch_writer_skips_filtered_and_broken_records() -> None:
+    stream = Stream()
+    queue = SimpleQueue()
+
+    def create_handler() -> logging.StreamHandler:
+        handler = logging.StreamHandler(stream)
+        handler.addFilter(lambda record: record.msg != "filtered")
+        handler.handleError = lambda record: None
+        return handler
+
+    queue.put(record(msg="kept"))
+    queue.put(record(msg="filtered"))
+    broken = record(msg="%d")
+    # formatting fails on the argument that is not a number
+    broken.args = ("one",)
+    queue.put(broken)
+    queue.put(record(msg="also kept"))
+
+    listener = BatchQueueListener(queue, create_handler, batch_size=10)
+    listener.start()
+    listener.stop()
+
+    assert stream.getvalue().splitlines() == ["kept", "also kept"]
@@ -0,0 +1,86 @@
+import uuid
+from collections.abc import Awaitable
+
+import pytest
+from httpx import AsyncClient, Response
+
+from src.dependencies.database import query_budget
+from src.exceptions.database_exception import QueryBudgetExceededError
+from tests.test_sample_router import create_samples
+
+
+async def statements(request: Awaitable[Response]) -> int:
+    """Statements a request executed, counted by an enclosing budget and
+    checked against the middleware's `X-Query-Count`."""
+    with query_budget() as counter:
+        response = await request
+
+    assert response.status_code == 200, response.text
+    assert int(response.headers["x-query-count"]) == counter.statements
+    return counter.statements
+
+
+async def test_outer_budget_sees_request_statements(
+    client: AsyncClient,
+) -> None:
+    (id,) = await create_samples(client, 1)
+
+    with pytest.raises(QueryBudgetExceededError):
+        with query_budget(0):
+            await client.get(f"/samples/{uuid.uuid4()}")
+
+    with query_budget(1) as counter:
+        await client.patch(f"/samples/{id}", json={"name": "renamed"})
+    assert counter.statements == 1
+
+
+async def test_read(client: AsyncClient) -> None:
+    (id,) = await create_samples(client, 1)
+
+    assert await statements(client.get(f"/samples/{id}")) == 1
+    # served from the cache the first read filled
+    assert await statements(client.get(f"/samples/{id}")) == 0
+
+
+async def test_read_all(client: AsyncClient) -> None:
+    await create_samples(client, 3)
+
+    # the page and its total count
+    assert await statements(client.get("/samples/", params={"size": 2})) == 2
+
+
+async def test_create(client: AsyncClient) -> None:
+    sample = {"id": str(uuid.uuid4())}
+
+    assert await statements(client.post("/samples/", json=sample)) == 1
+
+
+async def test_update(client: AsyncClient) -> None:
+    (id,) = await create_samples(client, 1)
+
+    request = client.patch(f"/samples/{id}", json={"name": "renamed"})
+    assert await statements(request) == 1
+
+
+async def test_delete(client: AsyncClient) -> None:
+    (id,) = await create_samples(client, 1)
+
+    assert await statements(client.delete(f"/samples/{id}")) == 1
+
+
+async def test_bulk(client: AsyncClient) -> None:
+    ids = [str(uuid.uuid4()) for _ in range(20)]
+
+    created = client.post("/samples/bulk", json=[{"id": id} for id in ids])
+    assert await statements(created) == 1
+
+    updated = client.patch(
+        "/samples/bulk", json=[{"id": id, "name": "renamed"} for id in ids]
+    )
+    assert await statements(updated) == 1
+
+    fetched = client.post("/samples:batchGet", json={"ids": ids})
+    assert await statements(fetched) == 1
+
+    deleted = client.request("DELETE", "/samples/bulk", json={"ids": ids})
+    assert await statements(deleted) == 1
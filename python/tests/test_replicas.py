@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.dependencies.database import SESSION_REPLICA_LAG, Replica
+from src.repositories import SampleRepository
+from tests.test_sample_router import create_samples
+
+
+@pytest.mark.parametrize(("lag", "cached"), [(0.0, True), (3.0, False)])
+async def test_only_caught_up_replicas_fill_the_cache(
+    app: FastAPI,
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    lag: float,
+    cached: bool,
+) -> None:
+    (id,) = await create_samples(client, 1)
+
+    # a replica on the primary's engine, within replica_max_lag
+    replica = Replica(app.state.engine)
+    replica.healthy = True
+    replica.lag = lag
+    monkeypatch.setattr(app.state.replicas, "replicas", [replica])
+
+    # a client without the read-your-writes cookie, so it reads the replica
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as reader:
+        response = await reader.get(f"/samples/{id}")
+
+    assert response.status_code == 200
+    assert (await app.state.cache.get(f"sample:{id}") is not None) == cached
+
+
+async def test_primary_read_does_not_join_a_replica_read(
+    app: FastAPI, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (id,) = await create_samples(client, 1)
+
+    replica = Replica(app.state.engine)
+    replica.healthy = True
+    monkeypatch.setattr(app.state.replicas, "replicas", [replica])
+
+    # the replica read holds its flight open until released
+    loaded, release = asyncio.Event(), asyncio.Event()
+    read_many = SampleRepository.read_many
+
+    async def paused(self: SampleRepository, ids):
+        samples = await read_many(self, ids)
+        if SESSION_REPLICA_LAG in self.db.info:
+            loaded.set()
+            await release.wait()
+        return samples
+
+    monkeypatch.setattr(SampleRepository, "read_many", paused)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as reader:
+        replica_read = asyncio.create_task(reader.get(f"/samples/{id}"))
+        await loaded.wait()
+
+        response = await asyncio.wait_for(
+            reader.get(f"/samples/{id}", headers={"X-Read-Primary": "1"}), 5
+        )
+        release.set()
+
+        assert response.status_code == 200
+        assert (await replica_read).status_code == 200
@@ -0,0 +1,47 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+
+async def create_samples(client: AsyncClient, count: int) -> list[str]:
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    for id in ids:
+        response = await client.post("/samples/", json={"id": id})
+        assert response.status_code == 200
+
+    return ids
+
+
+async def test_cursor_pages_forward(client: AsyncClient) -> None:
+    await create_samples(client, 3)
+
+    first = (await client.get("/samples/cursor", params={"size": 2})).json()
+    second = await client.get(
+        "/samples/cursor", params={"size": 2, "cursor": first["next_page"]}
+    )
+
+    assert second.status_code == 200
+    assert first["items"] and second.json()["items"]
+    assert {item["id"] for item in first["items"]}.isdisjoint(
+        item["id"] for item in second.json()["items"]
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "garbage",  # not base64
+        "//79",  # base64, not UTF-8
+        "Zm9v",  # base64 text, not JSON
+        "WzFd",  # JSON, not a three-item list
+        "WyJuZXh0IiwgMSwgMl0=",  # three items of the wrong types
+    ],
+)
+async def test_malformed_cursor_is_rejected(
+    client: AsyncClient, cursor: str
+) -> None:
+    response = await client.get("/samples/cursor", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "S400: Sample cursor is invalid"
@@ -0,0 +1,50 @@
+import sys
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+import uvicorn
+
+import src.main
+from src.dependencies import Environment
+from src.dependencies.config import Config, Server
+
+
+def run_server(
+    monkeypatch: pytest.MonkeyPatch,
+    override_config: Callable[..., Config],
+    **server,
+) -> dict[str, Any]:
+    """Options `server()` passes to uvicorn in production."""
+    override_config(
+        src.main, environment=Environment.PRODUCTION, server=Server(**server)
+    )
+    calls = []
+    monkeypatch.setattr(uvicorn, "run", lambda **options: calls.append(options))
+    monkeypatch.setattr(sys, "argv", ["app"])
+
+    src.main.server()
+
+    (options,) = calls
+    return options
+
+
+def test_workers_are_recycled(
+    monkeypatch: pytest.MonkeyPatch, override_config: Callable[..., Config]
+) -> None:
+    options = run_server(
+        monkeypatch, override_config, workers=4, limit_max_requests=1000
+    )
+    assert options["workers"] == 4
+    assert options["limit_max_requests"] == 1000
+
+
+def test_single_worker_is_not_recycled(
+    monkeypatch: pytest.MonkeyPatch, override_config: Callable[..., Config]
+) -> None:
+    options = run_server(
+        monkeypatch, override_config, workers=1, limit_max_requests=1000
+    )
+
+    assert options["workers"] == 1
+    assert options["limit_max_requests"] is None
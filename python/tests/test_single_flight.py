@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from src.dependencies.single_flight import SingleFlightGroup
+
+
+async def settle() -> None:
+    # lets every started caller reach the group
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_callers_share_one_call() -> None:
+    group = SingleFlightGroup()
+    release = asyncio.Event()
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "value"
+
+    callers = [asyncio.create_task(group.do("key", load)) for _ in range(3)]
+    await settle()
+
+    assert group.status()["in_flight"] == 1
+    release.set()
+    assert await asyncio.gather(*callers) == ["value"] * 3
+    assert calls == 1
+    assert group.status() == {
+        "executed": 1,
+        "coalesced": 2,
+        "in_flight": 0,
+        "coalesced_ratio": 2 / 3,
+    }
+
+
+async def test_error_reaches_every_caller() -> None:
+    group = SingleFlightGroup()
+    release = asyncio.Event()
+    error = ValueError("failed")
+
+    async def load() -> str:
+        await release.wait()
+        raise error
+
+    callers = [asyncio.create_task(group.do("key", load)) for _ in range(3)]
+    await settle()
+    release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert results == [error] * 3
+    # the failure is not kept for later callers
+    assert group.status()["in_flight"] == 0
+
+
+async def test_follower_leads_when_the_leader_is_cancelled() -> None:
+    group = SingleFlightGroup()
+    release = asyncio.Event()
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.Event().wait()
+        await release.wait()
+        return calls
+
+    leader = asyncio.create_task(group.do("key", load))
+    await settle()
+    followers = [asyncio.create_task(group.do("key", load)) for _ in range(2)]
+    await settle()
+
+    leader.cancel()
+    await settle()
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    # one follower retried and led, the other joined its call
+    assert await asyncio.gather(*followers) == [2, 2]
+    assert group.status()["executed"] == 2
+    assert group.status()["in_flight"] == 0
+
+
+async def test_cancelled_follower_leaves_the_call_running() -> None:
+    group = SingleFlightGroup()
+    release = asyncio.Event()
+
+    async def load() -> str:
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(group.do("key", load))
+    await settle()
+    follower = asyncio.create_task(group.do("key", load))
+    await settle()
+
+    follower.cancel()
+    await settle()
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+    assert await leader == "value"
+
+
+async def test_keys_do_not_share_calls() -> None:
+    group = SingleFlightGroup()
+
+    async def load() -> str:
+        await asyncio.sleep(0)
+        return "value"
+
+    await asyncio.gather(group.do("one", load), group.do("two", load))
+
+    assert group.status()["executed"] == 2
+    assert group.status()["coalesced"] == 0
@@ -0,0 +1,37 @@
+import os
+
+from fastapi import FastAPI
+
+from src.profiling import import_timings
+
+# seconds from a cold interpreter to serving, as in `--startup-budget`
+BUDGET = float(os.environ.get("STARTUP_BUDGET", "2.5"))
+
+
+def test_every_dependency_is_timed(app: FastAPI) -> None:
+    assert list(app.state.startup_timings) == [
+        f"src.dependencies.{name}"
+        for name in (
+            "config",
+            "logger",
+            "tracer",
+            "database",
+            "cache",
+            "single_flight",
+            "http_client",
+            "metrics",
+            "health",
+        )
+    ]
+
+
+def test_startup_is_within_budget(app: FastAPI) -> None:
+    # the session's lifespan ran once already, against the test database
+    lifespan = sum(app.state.startup_timings.values())
+    imports, packages = import_timings()
+
+    assert "src" in packages
+    assert imports + lifespan < BUDGET, (
+        f"imports took {imports:.3f}s and the lifespan {lifespan:.3f}s, "
+        f"budget is {BUDGET}s"
+    )
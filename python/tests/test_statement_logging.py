@@ -0,0 +1,155 @@
+import logging
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+from starlette.types import Receive, Scope, Send
+
+from src.dependencies import database
+from src.dependencies.config import Config, get_config
+from src.dependencies.database import (
+    QueryCountMiddleware,
+    _redact,
+    fingerprint,
+)
+
+
+def use(override_config: Callable[..., Config], **settings: Any) -> None:
+    override_config(
+        database,
+        database=get_config().database.model_copy(update=settings),
+    )
+
+
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    [
+        (
+            "SELECT * FROM samples WHERE name = 'it''s' AND size > 10.5",
+            "SELECT * FROM samples WHERE name = ? AND size > ?",
+        ),
+        (
+            "SELECT * FROM samples WHERE id = %(id_1)s LIMIT %(param_1)s",
+            "SELECT * FROM samples WHERE id = ? LIMIT ?",
+        ),
+        (
+            "SELECT * FROM samples WHERE id = $1 OR id = %s OR id = ?",
+            "SELECT * FROM samples WHERE id = ? OR id = ? OR id = ?",
+        ),
+        (
+            "SELECT * FROM samples WHERE id IN (?, ?, ?)",
+            "SELECT * FROM samples WHERE id IN (?)",
+        ),
+        (
+            "SELECT * FROM samples WHERE id IN (%(a)s::UUID, %(b)s::UUID)",
+            "SELECT * FROM samples WHERE id IN (?)",
+        ),
+        (
+            "INSERT INTO samples (id, name) VALUES (?, ?), (?, ?)",
+            "INSERT INTO samples (id, name) VALUES (?)",
+        ),
+        (
+            "SELECT *\n  FROM samples_2024\n WHERE id = 7",
+            "SELECT * FROM samples_2024 WHERE id = ?",
+        ),
+    ],
+)
+def test_fingerprint_replaces_values(statement: str, expected: str) -> None:
+    assert fingerprint(statement)[0] == expected
+
+
+def test_fingerprint_ignores_values_and_list_lengths() -> None:
+    _, digest = fingerprint("SELECT * FROM samples WHERE id IN (1, 2)")
+
+    assert fingerprint("SELECT * FROM samples WHERE id IN (3, 4, 5)")[1] == (
+        digest
+    )
+    assert fingerprint("SELECT * FROM other WHERE id IN (1, 2)")[1] != digest
+
+
+@pytest.mark.parametrize(
+    ("parameters", "executemany", "expected"),
+    [
+        (
+            {"name_1": "secret", "param_1": 50},
+            False,
+            "name_1: str, param_1: int",
+        ),
+        (("secret", 50), False, "str, int"),
+        (None, False, ""),
+        ([("secret",), ("other",)], True, "2 parameter sets"),
+        (tuple(range(21)), False, "21 parameters"),
+    ],
+)
+def test_redact_keeps_names_and_types(
+    parameters: Any, executemany: bool, expected: str
+) -> None:
+    assert _redact(parameters, executemany) == expected
+
+
+async def test_slow_query_log_has_no_values(
+    client: AsyncClient,
+    override_config: Callable[..., Config],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    # every statement is slow
+    use(override_config, slow_query_threshold=1e-9)
+
+    with caplog.at_level(logging.WARNING):
+        response = await client.get(
+            "/samples/", params={"name": "secret value"}
+        )
+
+    assert response.status_code == 200
+    (slow, *_) = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith("slow query")
+    ]
+    assert "WHERE samples.name = ?" in slow
+    assert "[str" in slow
+    assert all("secret" not in record.getMessage() for record in caplog.records)
+
+
+@pytest.mark.parametrize(("times", "warned"), [(3, False), (4, True)])
+async def test_n_plus_one_warning_above_the_threshold(
+    app: FastAPI,
+    override_config: Callable[..., Config],
+    caplog: pytest.LogCaptureFixture,
+    times: int,
+    warned: bool,
+) -> None:
+    use(override_config, n_plus_one_threshold=3)
+
+    async def repeat(scope: Scope, receive: Receive, send: Send) -> None:
+        async with app.state.engine.connect() as conn:
+            for id in range(times):
+                await conn.execute(text(f"SELECT {id}"))
+        await send({"type": "http.response.start", "status": 200})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/repeat"}
+    with caplog.at_level(logging.WARNING):
+        await QueryCountMiddleware(repeat)(scope, receive, send)
+
+    warnings = [
+        record.getMessage()
+        for record in caplog.records
+        if "N+1" in record.getMessage()
+    ]
+    assert bool(warnings) == warned
+    if warned:
+        (warning,) = warnings
+        assert f"GET /repeat ran statement {fingerprint('SELECT ?')[1]}" in (
+            warning
+        )
+        assert f"{times} times" in warning
@@ -0,0 +1,125 @@
+import uuid
+from collections.abc import Callable
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from opentelemetry import trace
+from opentelemetry.sdk.trace.sampling import Decision, Sampler
+from opentelemetry.trace import (
+    NonRecordingSpan,
+    SpanContext,
+    TraceFlags,
+    set_span_in_context,
+)
+
+from src.dependencies import tracer
+from src.dependencies.config import Config, Tracing, get_config
+from tests.test_sample_router import create_samples
+
+# TraceIdRatioBased samples on the lower 64 bits of the trace id
+LOW_TRACE_ID = 1
+HIGH_TRACE_ID = 2**64 - 1
+
+
+def sampler(override_config: Callable[..., Config], **tracing) -> Sampler:
+    override_config(tracer, tracing=Tracing(**tracing))
+    return tracer.create_sampler()
+
+
+def decide(sampler: Sampler, trace_id: int, parent: bool | None) -> Decision:
+    context = None
+    if parent is not None:
+        flags = TraceFlags(TraceFlags.SAMPLED if parent else TraceFlags.DEFAULT)
+        context = set_span_in_context(
+            NonRecordingSpan(
+                SpanContext(trace_id, 1, is_remote=True, trace_flags=flags)
+            )
+        )
+
+    return sampler.should_sample(context, trace_id, "span").decision
+
+
+@pytest.mark.parametrize(
+    ("ratio", "trace_id", "expected"),
+    [
+        (1.0, HIGH_TRACE_ID, Decision.RECORD_AND_SAMPLE),
+        (0.0, LOW_TRACE_ID, Decision.DROP),
+        (0.5, LOW_TRACE_ID, Decision.RECORD_AND_SAMPLE),
+        (0.5, HIGH_TRACE_ID, Decision.DROP),
+    ],
+)
+def test_root_spans_follow_the_ratio(
+    override_config: Callable[..., Config],
+    ratio: float,
+    trace_id: int,
+    expected: Decision,
+) -> None:
+    for parent_based in (True, False):
+        created = sampler(
+            override_config, sample_ratio=ratio, parent_based=parent_based
+        )
+        assert decide(created, trace_id, parent=None) == expected
+
+
+@pytest.mark.parametrize("parent", [True, False])
+def test_parent_based_follows_the_parent(
+    override_config: Callable[..., Config], parent: bool
+) -> None:
+    # a ratio that would decide the other way for a root span
+    created = sampler(
+        override_config, sample_ratio=0.0 if parent else 1.0, parent_based=True
+    )
+
+    assert decide(created, LOW_TRACE_ID, parent) == (
+        Decision.RECORD_AND_SAMPLE if parent else Decision.DROP
+    )
+
+
+def test_ratio_alone_ignores_the_parent(
+    override_config: Callable[..., Config],
+) -> None:
+    created = sampler(override_config, sample_ratio=0.0, parent_based=False)
+
+    assert decide(created, LOW_TRACE_ID, parent=True) == Decision.DROP
+
+
+def test_installed_provider_uses_the_configured_sampler(app: FastAPI) -> None:
+    assert trace.get_tracer_provider() is app.state.tracer_provider
+    assert (
+        app.state.tracer_provider.sampler.get_description()
+        == tracer.create_sampler().get_description()
+    )
+
+
+async def test_observed_spans_carry_code_attributes(
+    app: FastAPI, client: AsyncClient
+) -> None:
+    (id,) = await create_samples(client, 1)
+    app.state.span_exporter.clear()
+
+    response = await client.get(f"/samples/{id}")
+
+    assert response.status_code == 200
+    spans = {
+        span.name: span for span in app.state.span_exporter.get_finished_spans()
+    }
+    attributes = spans["read"].attributes
+    assert attributes["code.function"] == "read"
+    assert attributes["code.namespace"] == "src.routers.sample_router"
+    assert attributes["code.filepath"].endswith("src/routers/sample_router.py")
+    assert attributes["service.name"] == get_config().service
+
+
+async def test_statement_spans_are_children_of_the_route(
+    app: FastAPI, client: AsyncClient
+) -> None:
+    app.state.span_exporter.clear()
+
+    await client.get(f"/samples/{uuid.uuid4()}")
+
+    spans = app.state.span_exporter.get_finished_spans()
+    (route,) = [span for span in spans if span.name == "read"]
+    (statement,) = [span for span in spans if span.name.startswith("SELECT")]
+    assert statement.parent.span_id == route.context.span_id
+    assert statement.attributes["db.operation"] == "SELECT"